@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from contextlib import asynccontextmanager
@@ -11,6 +11,11 @@ import os
 from datetime import datetime, timedelta
 import httpx
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import local modules
 from config import settings
 from database.database import get_db, create_tables
@@ -64,9 +69,15 @@ from schemas.dyslexia_test import DyslexiaTestCreate, DyslexiaTestResponse
 async def lifespan(app: FastAPI):
     # Startup
     create_tables()
+    # Load OCR language data and detection cascades before the first upload
+    if hasattr(handwriting_recognizer, "warmup"):
+        handwriting_recognizer.warmup()
     yield
-    # Shutdown (if needed)
-    pass
+    # Shutdown: release pooled provider connections
+    if hasattr(speech_processor, "close"):
+        await speech_processor.close()
+    if hasattr(text_analyzer, "close"):
+        await text_analyzer.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -413,6 +424,14 @@ async def highlight_text(text: str):
     }
 
 # Speech processing endpoints
+def _speech_response(result):
+    """Transcripts carry long segment lists; encode them with orjson directly when it's installed
+    instead of walking them through jsonable_encoder first"""
+    if orjson is not None and isinstance(result, dict):
+        content = orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return Response(content=content, media_type="application/json")
+    return result
+
 @app.post("/api/speech-to-text")
 async def speech_to_text(
     audio_file: UploadFile = File(...),
@@ -420,15 +439,20 @@ async def speech_to_text(
     current_user: User = Depends(get_current_user)
 ):
     """Convert speech to text"""
+    content = await audio_file.read()
+    # Providers that take in-memory audio skip the temporary upload file
+    if hasattr(speech_processor, "process_speech_to_text_bytes"):
+        result = await speech_processor.process_speech_to_text_bytes(content, language)
+        return _speech_response(result)
+    
     # Save uploaded file temporarily
     file_path = f"{settings.UPLOAD_DIR}/{uuid.uuid4()}_{audio_file.filename}"
     with open(file_path, "wb") as buffer:
-        content = await audio_file.read()
         buffer.write(content)
     
     try:
         result = await speech_processor.process_speech_to_text(file_path, language)
-        return result
+        return _speech_response(result)
     finally:
         # Clean up temporary file
         if os.path.exists(file_path):
@@ -976,27 +1000,27 @@ async def take_dyslexia_test(
         "created_at": datetime.utcnow().isoformat()
     }
 
+# Dyslexia indicators - higher score means higher risk
+DYSLEXIA_INDICATORS = {
+    1: frozenset('bcd'),  # Struggled with reading
+    2: frozenset('bcd'),  # Spelling difficulties
+    3: frozenset('acd'),  # Visual discrimination issues
+    4: frozenset('bcd'),  # Phonetic awareness problems
+    5: frozenset('abd'),  # Working memory issues
+    6: frozenset('bcd'),  # Slow reading speed
+    7: frozenset('acd'),  # Comprehension difficulties
+    8: frozenset('bcd')   # Writing challenges
+}
+_NO_INDICATORS = frozenset()
+
 def calculate_test_score(answers: dict) -> float:
     """Calculate dyslexia risk score based on answers"""
-    # Dyslexia indicators - higher score means higher risk
-    dyslexia_indicators = {
-        1: ['b', 'c', 'd'],  # Struggled with reading
-        2: ['b', 'c', 'd'],  # Spelling difficulties
-        3: ['a', 'c', 'd'],  # Visual discrimination issues
-        4: ['b', 'c', 'd'],  # Phonetic awareness problems
-        5: ['a', 'b', 'd'],  # Working memory issues
-        6: ['b', 'c', 'd'],  # Slow reading speed
-        7: ['a', 'c', 'd'],  # Comprehension difficulties
-        8: ['b', 'c', 'd']   # Writing challenges
-    }
-    
-    total_questions = len(dyslexia_indicators)
+    total_questions = len(DYSLEXIA_INDICATORS)
     risk_indicators = 0
-    
     for question_id, answer_data in answers.items():
-        question_num = int(question_id)
-        selected_answer = answer_data.get('selected')
-        if selected_answer in dyslexia_indicators.get(question_num, []):
+        selected = answer_data.get('selected')
+        # Only string answers can be indicators; a list or dict would not hash in the frozenset lookup
+        if isinstance(selected, str) and selected in DYSLEXIA_INDICATORS.get(int(question_id), _NO_INDICATORS):
             risk_indicators += 1
     
     return (risk_indicators / total_questions) * 100 if total_questions > 0 else 0
@@ -1057,6 +1081,10 @@ except ImportError:
             return {"id": lesson_id, "title": "Lesson", "content": "Basic content"}
         def get_lessons_by_category(self, category):
             return []
+        def get_lesson_json(self, lesson_id):
+            return json.dumps(self.get_lesson(lesson_id)).encode()
+        def get_lessons_by_category_json(self, category):
+            return b"[]"
     
     class MockAITutor:
         def analyze_user_input(self, message, context=None):
@@ -1095,17 +1123,17 @@ async def get_lessons(current_user: User = Depends(get_current_user)):
 @app.get("/api/lessons/{lesson_id}")
 async def get_lesson_detail(lesson_id: int, current_user: User = Depends(get_current_user)):
     """Get detailed lesson content"""
-    lesson = lesson_manager.get_lesson(lesson_id)
-    if not lesson:
+    # Lesson content is static and served pre-serialized
+    lesson_json = lesson_manager.get_lesson_json(lesson_id)
+    if not lesson_json:
         raise HTTPException(status_code=404, detail="Lesson not found")
     
-    return lesson
+    return Response(content=lesson_json, media_type="application/json")
 
 @app.get("/api/lessons/category/{category}")
 async def get_lessons_by_category(category: str, current_user: User = Depends(get_current_user)):
     """Get lessons by category"""
-    lessons = lesson_manager.get_lessons_by_category(category)
-    return lessons
+    return Response(content=lesson_manager.get_lessons_by_category_json(category), media_type="application/json")
 
 @app.get("/api/learning-videos")
 async def get_learning_videos(level: str = "beginner"):
@@ -0,0 +1,45 @@
+"""
+Spelling correction tables shared by every text analyzer
+Built once per process and read-only, so all analyzers match against the same objects
+"""
+
+import re
+from types import MappingProxyType
+
+# Common dyslexic error patterns - lightweight rule-based approach
+CORRECTIONS = MappingProxyType({
+    # Common reversals and confusions
+    'teh': 'the', 'hte': 'the', 'thier': 'their', 'recieve': 'receive',
+    'beleive': 'believe', 'seperate': 'separate', 'definately': 'definitely',
+    'occured': 'occurred', 'neccessary': 'necessary', 'begining': 'beginning',
+    'alot': 'a lot', 'wierd': 'weird', 'freind': 'friend',
+    # b/d reversals
+    'abd': 'and', 'doy': 'boy', 'bid': 'did', 'dack': 'back',
+    # p/q reversals
+    'qut': 'put', 'puite': 'quite',
+    # Common phonetic errors
+    'lite': 'light', 'nite': 'night', 'wuz': 'was', 'sed': 'said',
+    # Single letter errors (common with dyslexia)
+    'oog': 'dog', 'og': 'dog', 'qan': 'can', 'pan': 'pan', 'ban': 'ban',
+    'bog': 'dog', 'cog': 'dog', 'fog': 'fog', 'hog': 'hog', 'jog': 'jog', 'log': 'log',
+    # Common misspellings
+    'stuby': 'study', 'tum': 'them', 'i': 'I'
+})
+
+# Whole-word patterns flagged on top of the spelling table
+REVERSAL_WORDS = ('abd', 'doy', 'bid', 'dack', 'qut', 'puite')
+PHONETIC_WORDS = ('lite', 'nite', 'wuz', 'sed', 'cuz', 'becuz')
+
+# One table for every whole-word check: word -> (spelling correction, pattern name)
+WORD_CHECKS = {word: (correct, None) for word, correct in CORRECTIONS.items()}
+for _pattern, _pattern_words in (('letter_reversal', REVERSAL_WORDS), ('phonetic', PHONETIC_WORDS)):
+    for _word in _pattern_words:
+        WORD_CHECKS[_word] = (WORD_CHECKS.get(_word, (None, None))[0], _pattern)
+del _pattern, _pattern_words, _word
+
+# Subset the grammar fallback rewrites when no grammar model is loaded, matched in a single pass
+FALLBACK_WORDS = (
+    "recieve", "seperate", "definately", "occured", "nite",
+    "lite", "thier", "teh", "hte", "beleive"
+)
+CORRECTION_RE = re.compile(r'\b(' + '|'.join(map(re.escape, FALLBACK_WORDS)) + r')\b', re.IGNORECASE)
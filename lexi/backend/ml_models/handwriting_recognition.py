@@ -1,19 +1,256 @@
+import asyncio
+import copy
+import functools
+import hashlib
+import io
+import math
+import multiprocessing
 import os
-from typing import Dict, List, Any
+import queue
+import re
+import string
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Any, NamedTuple, Optional
 from PIL import Image
 from config import settings
 
+# OpenCV/NumPy are optional at import time; the analysis paths that need them
+# are wrapped in try/except and degrade gracefully when they are missing
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+# Keep each Tesseract call single-threaded so the OCR pool below scales with cores
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+# Shared pool for independent (image variant, psm) OCR attempts; Tesseract releases the GIL
+_OCR_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="ocr")
+
+# Process-wide pools of in-process Tesseract APIs, keyed by language. PyTessBaseAPI is
+# not thread-safe, so each OCR attempt leases one for its duration.
+_TESS_API_POOLS: Dict[str, "queue.LifoQueue"] = {}
+_TESS_POOL_LOCK = threading.Lock()
+_TESS_POOL_SIZE = os.cpu_count() or 1
+_TESS_FAILED_LANGUAGES: set = set()
+
+# An attempt this confident is accepted without waiting for the rest of the sweep
+_GOOD_ENOUGH_CONF = 85.0
+_GOOD_ENOUGH_MIN_CHARS = 3
+
+# Score at which the cached best config is trusted without a full sweep
+_CACHED_CONFIG_MIN_SCORE = 0.75
+_BEST_CONFIG_CACHE_SIZE = 64
+
+# Finished results per (file content hash, language); re-uploads of the same page skip OCR
+_RESULT_CACHE_SIZE = 32
+
+# Upload formats Tesseract (Leptonica) can read straight from disk
+_TESSERACT_FILE_FORMATS = ('PNG', 'JPEG', 'TIFF', 'BMP', 'GIF')
+
+# Face detection only needs to answer "is there a face", so it runs on a small probe
+_FACE_PROBE_SIZE = 320
+
+# JPEG uploads larger than this (per side) are decoded at reduced scale
+_JPEG_DRAFT_SIZE = 2000
+_VALIDATION_MAX_SIDE = 512
+# Sobel edge density bounds, calibrated on the 512px copy against the old Canny ones. Without
+# non-maximum suppression, stroke outlines come out ~2.8x denser but fine grain only ~1.3x, so
+# each bound has its own factor; the lower one is in full-resolution units (density * scale)
+_EDGE_MAGNITUDE_THRESHOLD = 50
+_EDGE_DENSITY_MIN = 0.027
+_EDGE_DENSITY_MAX = 0.4
+_SKIN_LOWER_HSV = (0, 20, 70)
+_SKIN_UPPER_HSV = (20, 255, 255)
+_FACE_CASCADE_FILES = ('lbpcascade_frontalface_improved.xml', 'haarcascade_frontalface_default.xml')
+
+# Letters with a drawn 32x32 reference template (_create_<letter>_template)
+_TEMPLATE_LETTERS = 'abcdeghilmnoprstuw'
+
+# Character matches come from one sparse-text OCR pass over the whole page rather
+# than one Tesseract call per character crop
+_CHAR_OCR_LANGUAGE = "eng"
+_CHAR_OCR_PSM = 11
+_CHAR_MATCH_MIN_IOU = 0.1
+_CHAR_MATCH_MIN_CONF = 10.0
+# Characters the page pass reads above this confidence skip geometric/error analysis
+_CONFIDENT_MATCH = 0.85
+_CHAR_WHITELIST = string.ascii_letters
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _find_valleys(proj, thresh: int, min_run: int):
+    """Scan a column projection and return (start, end) runs of ink longer than min_run
+    that end where the projection drops to a valley (<= thresh), as an (N, 2) int32 array."""
+    segments = np.empty((proj.shape[0], 2), dtype=np.int32)
+    n = 0
+    in_gap = False
+    start = 0
+    for i in range(proj.shape[0]):
+        val = proj[i]
+        if val <= thresh and not in_gap:
+            in_gap = True
+            if i - start > min_run:
+                segments[n, 0] = start
+                segments[n, 1] = i
+                n += 1
+        elif val > thresh and in_gap:
+            in_gap = False
+            start = i
+    return segments[:n]
+
+
+if njit is not None:
+    _find_valleys = njit(cache=True)(_find_valleys)
+    # Compile now rather than on the first wide character of a request
+    _find_valleys(np.zeros(16, dtype=np.int32), 0, 5)
+
+# Common OCR letter-pair confusions, fixed in one left-to-right pass. No key shares a
+# letter with another or can be re-formed by a replacement, so this matches applying
+# them one after another.
+_OCR_FIXES = {'rn': 'm', 'cl': 'd', 'vv': 'w', 'ii': 'n'}
+_OCR_FIX_RE = re.compile('|'.join(re.escape(k) for k in _OCR_FIXES))
+_OCR_CONFUSIONS = {
+    '0': 'O', '1': 'I', '5': 'S', '8': 'B',
+    'cl': 'd', 'rn': 'm', 'vv': 'w', 'ii': 'n'
+}
+_OCR_CONFUSION_RE = re.compile('|'.join(re.escape(k) for k in _OCR_CONFUSIONS))
+_INLINE_WS_RE = re.compile(r'[^\S\n]+')
+_ISOLATED_ONE_RE = re.compile(r'\b1\b')
+_ISOLATED_ZERO_RE = re.compile(r'\b0\b')
+_REPEAT_RE = re.compile(r'(.)\1{3,}')
+
+# str.isalnum() or str.isspace() for every ASCII code point, for byte-wise counting
+_READABLE_ASCII = None if np is None else np.array(
+    [chr(i).isalnum() or chr(i).isspace() for i in range(128)], dtype=bool
+)
+
+@functools.lru_cache(maxsize=4)
+def _load_overlay_base(image_path: str, mtime_ns: int, size: Optional[tuple]):
+    """Decoded (and resized) BGR page for overlays, shared by both overlays of a request.
+    Read-only: callers draw on a copy."""
+    img = cv2.imread(image_path)
+    if img is not None and size and (img.shape[1], img.shape[0]) != size:
+        img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+    if img is not None:
+        img.setflags(write=False)
+    return img
+
+
+# Overlay box colors (BGR): low / medium / high top-match confidence, then characters with errors
+_OVERLAY_PALETTE = None if np is None else np.array(
+    [(255, 0, 0), (0, 255, 255), (0, 255, 0), (0, 0, 255)], dtype=np.int32
+)
+_OVERLAY_CONF_BANDS = (0.4, 0.7)
+
+# Features reported when a character's shape cannot be analyzed (copied per character)
+_DEFAULT_FEATURES = {
+    "area": 100,
+    "aspect_ratio": 1.0,
+    "has_loops": False,
+    "has_curves": False,
+    "stroke_count": 1
+}
+
+# Shared result for characters with no detected errors (never mutated by callers)
+_EMPTY_ERRORS: tuple = ()
+
+class _OcrToken(NamedTuple):
+    """Compact per-word OCR result used while ranking attempts."""
+    word: str
+    conf: float
+    left: int
+    top: int
+    width: int
+    height: int
+    line_num: int
+    block_num: int
+    par_num: int
+    word_num: int
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "word": self.word,
+            "conf": self.conf,
+            "bbox": [self.left, self.top, self.width, self.height],
+            "line_num": self.line_num,
+            "block_num": self.block_num,
+            "par_num": self.par_num,
+            "word_num": self.word_num
+        }
+
+
+class _CharacterTable(NamedTuple):
+    """Struct-of-arrays view of detected characters for vectorized drawing and grouping."""
+    bboxes: Any         # (N, 4) int32 x, y, w, h
+    confs: Any          # (N,) float64 top-match confidence, 0 when unmatched
+    has_errors: Any     # (N,) bool
+    letters: List[str]  # top-match letter, '' when unmatched
+
+    @classmethod
+    def build(cls, bboxes: List[Any], matches: List[List[Dict[str, Any]]], errors: List[Any]) -> "_CharacterTable":
+        tops = [m[0] if m else {} for m in matches]
+        return cls(
+            np.array(bboxes, dtype=np.int32).reshape(-1, 4),
+            np.array([t.get("confidence", 0) for t in tops], dtype=np.float64),
+            np.array([bool(e) for e in errors], dtype=bool),
+            [t.get("letter", "") or "" for t in tops]
+        )
+
+    @classmethod
+    def from_characters(cls, characters: List[Dict[str, Any]]) -> "_CharacterTable":
+        return cls.build(
+            [c.get("bbox", [0, 0, 0, 0]) for c in characters],
+            [c.get("template_matches") or [] for c in characters],
+            [c.get("errors") for c in characters]
+        )
+
+
 class TesseractOCRProcessor:
     """Enhanced OCR with character analysis"""
     
+    # Face cascade shared by all instances; loaded on first use
+    _face_cascade = None
+    _face_cascade_loaded = False
+    _skin_luts = None
+    _templates = None
+    
     def __init__(self):
         self.tesseract_available = False
+        self.pytesseract = None
+        self.tesserocr = None
+        # Recently winning (variant index, psm) per coarse image signature
+        self._best_config_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._best_config_lock = threading.Lock()
+        self._result_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._result_lock = threading.Lock()
         try:
             import pytesseract
             self.pytesseract = pytesseract
             self.tesseract_available = True
         except ImportError:
             print("Tesseract not available")
+        try:
+            # Preferred: keeps the language model loaded instead of spawning a process per call
+            import tesserocr
+            self.tesserocr = tesserocr
+            self.tesseract_available = True
+        except ImportError:
+            pass
 
     async def recognize_handwriting(self, image_path: str, language: str = "en") -> Dict[str, Any]:
         """Recognize handwriting with content validation"""
@@ -50,7 +287,18 @@ class TesseractOCRProcessor:
             if not language or not isinstance(language, str):
                 language = "en"
             
-            image = Image.open(image_path)
+            # Disk reads and writes, decoding and OCR all run in worker threads so the
+            # event loop keeps serving other requests meanwhile
+            image_bytes = await asyncio.to_thread(self._read_file, image_path)
+            cache_key = hashlib.blake2b(image_bytes, digest_size=16).hexdigest() + ':' + language
+            with self._result_lock:
+                cached = self._result_cache.get(cache_key)
+                if cached is not None:
+                    self._result_cache.move_to_end(cache_key)
+            if cached is not None:
+                return await asyncio.to_thread(self._reuse_cached_result, cached, image_path)
+            
+            image = Image.open(io.BytesIO(image_bytes))
             if image is None:
                 return {
                     "success": False,
@@ -60,25 +308,39 @@ class TesseractOCRProcessor:
                     "character_analysis": {"characters": []}
                 }
             
+            # Large phone-camera JPEGs decode at a reduced scale for free during the DCT;
+            # OCR gains nothing past ~2000px. The file on disk then no longer matches the
+            # pixel grid we analyze, so stop handing the raw path to Tesseract.
+            ocr_path = image_path
+            if image.format == 'JPEG':
+                full_size = image.size
+                image.draft('RGB', (_JPEG_DRAFT_SIZE, _JPEG_DRAFT_SIZE))
+                if image.size != full_size:
+                    ocr_path = None
+            
+            # Decode to grayscale once (character and quality analysis share it) and
             # VALIDATE IMAGE CONTENT FIRST (non-blocking)
-            content_validation = self._validate_image_content(image)
+            gray, content_validation = await asyncio.to_thread(self._decode_and_validate, image)
             validation_warning = None
             if not content_validation.get("is_handwriting", True):
                 # Do not fail early; proceed with OCR but keep the warning for context
                 validation_warning = content_validation.get("message")
             
-            # Perform OCR with per-word tokens
-            ocr_result = self._ocr_with_tokens(image, language)
+            # Perform OCR with per-word tokens; uploads that failed validation only get
+            # a single cheap pass instead of the full sweep. Character analysis does not
+            # depend on the OCR text (and always runs, even if OCR fails), so it overlaps.
+            ocr = self._ocr_with_tokens if validation_warning is None else self._ocr_single
+            ocr_result, (character_analysis, char_table) = await asyncio.gather(
+                asyncio.to_thread(ocr, image, language, ocr_path),
+                asyncio.to_thread(self._segment_characters, image_path, gray)
+            )
             text = ocr_result.get("text", "")
             tokens = ocr_result.get("tokens", [])
             
-            # Always run character analysis even if OCR fails
-            character_analysis = self._analyze_characters(image_path)
-            
             # If OCR text is empty, attempt to assemble text from detected characters (big isolated letters)
             if (not text or not text.strip()) and character_analysis.get("characters"):
                 try:
-                    assembled = self._assemble_text_from_characters(character_analysis.get("characters", []))
+                    assembled = self._assemble_text_from_characters(character_analysis.get("characters", []), char_table)
                     if assembled:
                         text = assembled
                 except Exception:
@@ -95,11 +357,14 @@ class TesseractOCRProcessor:
             # Try to generate an overlay that shows words and character issues
             visual_overlay_path = ""
             try:
-                visual_overlay_path = self._generate_visual_overlay_with_words(
+                visual_overlay_path = await asyncio.to_thread(
+                    self._generate_visual_overlay_with_words,
                     image_path,
                     character_analysis,
                     tokens,
-                    word_feedback
+                    word_feedback,
+                    size=image.size,
+                    table=char_table
                 )
             except Exception:
                 # Fallback to previous overlay
@@ -118,7 +383,7 @@ class TesseractOCRProcessor:
                 "recognized_text": text,
                 "confidence": self._estimate_confidence(text),
                 "errors": self._analyze_basic_errors(text),
-                "image_analysis": self._analyze_image_quality(image),
+                "image_analysis": self._analyze_image_quality(image, gray),
                 "character_analysis": character_analysis,
                 "tokens": tokens,
                 "word_feedback": word_feedback,
@@ -127,6 +392,11 @@ class TesseractOCRProcessor:
             }
             if validation_warning:
                 result["validation_warning"] = validation_warning
+            
+            with self._result_lock:
+                self._result_cache[cache_key] = copy.deepcopy(result)
+                while len(self._result_cache) > _RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
             return result
             
         except Exception as e:
@@ -138,21 +408,56 @@ class TesseractOCRProcessor:
                 "confidence": 0.0
             }
     
+    def _read_file(self, path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+    
+    def _decode_and_validate(self, image: Image.Image) -> tuple:
+        """Grayscale pixels of the upload plus its content validation"""
+        gray = np.array(image.convert('L'))
+        return gray, self._validate_image_content(image)
+    
+    def _reuse_cached_result(self, cached: Dict[str, Any], image_path: str) -> Dict[str, Any]:
+        """Copy a cached result for a new upload of the same page; only the overlays are redrawn,
+        so they land next to (and point at) the new file."""
+        result = copy.deepcopy(cached)
+        size = tuple(result["image_analysis"]["image_size"])
+        character_analysis = result["character_analysis"]
+        character_analysis["visual_overlay_path"] = self._generate_visual_overlay(image_path, character_analysis, size=size)
+        try:
+            result["visual_overlay_path"] = self._generate_visual_overlay_with_words(
+                image_path,
+                character_analysis,
+                result["tokens"],
+                result["word_feedback"],
+                size=size
+            )
+        except Exception:
+            result["visual_overlay_path"] = character_analysis["visual_overlay_path"]
+        return result
+    
     def _validate_image_content(self, image: Image.Image) -> Dict[str, Any]:
         """Validate that image contains handwriting, not humans or other content"""
         try:
-            import cv2
-            import numpy as np
-            
-            # Convert PIL to OpenCV format
+            # Convert PIL to OpenCV format. The color spread is read at full resolution,
+            # since averaging pixels down shrinks it; the other checks share one small copy
             img_array = np.array(image.convert('RGB'))
-            img_cv = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-            gray = cv2.cvtColor(img_cv, cv2.COLOR_BGR2GRAY)
+            height, width = img_array.shape[:2]
+            color_std = cv2.meanStdDev(cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY))[1][0][0]
+            copy_scale = min(1.0, _VALIDATION_MAX_SIDE / max(height, width))
+            if copy_scale < 1.0:
+                img_array = cv2.resize(img_array, None, fx=copy_scale, fy=copy_scale, interpolation=cv2.INTER_AREA)
+            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+            small_area = gray.shape[0] * gray.shape[1]
             
-            # Check for human features (face detection)
+            # Check for human features (face detection) on a downscaled probe
             try:
-                face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+                face_cascade = self._get_face_cascade()
+                probe = gray
+                scale = _FACE_PROBE_SIZE / max(gray.shape)
+                if scale < 1.0:
+                    probe = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                faces = face_cascade.detectMultiScale(probe, 1.1, 4, minSize=(40, 40)) if face_cascade is not None else ()
                 
                 if len(faces) > 0:
                     return {
@@ -163,9 +468,7 @@ class TesseractOCRProcessor:
             except:
                 pass  # Face detection failed, continue with other checks
             
-            # Check image characteristics for handwriting
-            height, width = gray.shape
-            
+            # Check image characteristics for handwriting (original resolution)
             # Check if image is too small for meaningful handwriting
             if width < 100 or height < 50:
                 return {
@@ -175,7 +478,6 @@ class TesseractOCRProcessor:
                 }
             
             # Analyze color distribution
-            color_std = np.std(gray)
             if color_std < 10:  # Very uniform color (likely blank or solid color)
                 return {
                     "is_handwriting": False,
@@ -183,20 +485,25 @@ class TesseractOCRProcessor:
                     "message": "I don't see any handwriting in this image. Please make sure there's clear text written on paper."
                 }
             
-            # Check for text-like patterns using edge detection
-            edges = cv2.Canny(gray, 50, 150)
-            edge_density = np.sum(edges > 0) / (width * height)
+            # Check for text-like patterns using a thresholded Sobel gradient magnitude
+            grad_x = cv2.convertScaleAbs(cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3))
+            grad_y = cv2.convertScaleAbs(cv2.Sobel(gray, cv2.CV_16S, 0, 1, ksize=3))
+            magnitude = cv2.addWeighted(grad_x, 0.5, grad_y, 0.5, 0)
+            _, edges = cv2.threshold(magnitude, _EDGE_MAGNITUDE_THRESHOLD, 255, cv2.THRESH_BINARY)
+            edge_density = cv2.countNonZero(edges) / small_area
             
             # Too many edges might indicate complex scenes (photos of people/objects)
-            if edge_density > 0.3:
+            if edge_density > _EDGE_DENSITY_MAX:
                 return {
                     "is_handwriting": False,
                     "detected_type": "complex_scene",
                     "message": "This looks like a photo rather than handwriting. Please upload an image of text written on paper."
                 }
             
-            # Too few edges might indicate blank page or very faint writing
-            if edge_density < 0.01:
+            # Too few edges might indicate blank page or very faint writing. Stroke outlines
+            # shrink with the side length in the copy, so this bound is checked against the
+            # density the full-resolution image would have
+            if edge_density * copy_scale < _EDGE_DENSITY_MIN:
                 return {
                     "is_handwriting": False,
                     "detected_type": "no_content",
@@ -204,13 +511,14 @@ class TesseractOCRProcessor:
                 }
             
             # Check for skin-like colors (indicates human in photo)
-            hsv = cv2.cvtColor(img_cv, cv2.COLOR_BGR2HSV)
+            hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
             
-            # Define skin color range in HSV
-            lower_skin = np.array([0, 20, 70], dtype=np.uint8)
-            upper_skin = np.array([20, 255, 255], dtype=np.uint8)
-            skin_mask = cv2.inRange(hsv, lower_skin, upper_skin)
-            skin_ratio = np.sum(skin_mask > 0) / (width * height)
+            # Skin color range in HSV, applied per channel through precomputed LUTs
+            lut_h, lut_s, lut_v = self._get_skin_luts()
+            h_chan, s_chan, v_chan = cv2.split(hsv)
+            skin_mask = cv2.bitwise_and(cv2.LUT(h_chan, lut_h), cv2.LUT(s_chan, lut_s))
+            skin_mask = cv2.bitwise_and(skin_mask, cv2.LUT(v_chan, lut_v))
+            skin_ratio = cv2.countNonZero(skin_mask) / small_area
             
             if skin_ratio > 0.15:  # More than 15% skin-colored pixels
                 return {
@@ -234,34 +542,97 @@ class TesseractOCRProcessor:
                 "message": f"Could not validate image content: {str(e)}"
             }
 
+    def warmup(self, languages: tuple = ("en",)) -> None:
+        """Load the face cascade, skin LUTs and Tesseract language data before the first request."""
+        try:
+            self._get_face_cascade()
+            self._get_skin_luts()
+            self._get_templates()
+        except Exception:
+            pass
+        if not self.tesseract_available:
+            return
+        blank = Image.new('L', (32, 32), 255)
+        # Character analysis always reads letters in _CHAR_OCR_LANGUAGE
+        for language in dict.fromkeys(tuple(languages) + (_CHAR_OCR_LANGUAGE,)):
+            try:
+                # Prefill the in-process API pool (no-op without tesserocr)
+                with ExitStack() as stack:
+                    for _ in range(min(4, _TESS_POOL_SIZE)):
+                        if stack.enter_context(self._leased_tess_api(language)) is None:
+                            break
+                # One tiny OCR call pulls the traineddata into the OS page cache
+                self._image_to_string(blank, language, 6)
+            except Exception:
+                continue
+        try:
+            # Same for the preconfigured single-character APIs, each run once so the
+            # first real crop does not pay for LSTM initialization
+            with ExitStack() as stack:
+                for _ in range(min(4, _TESS_POOL_SIZE)):
+                    api = stack.enter_context(self._leased_tess_api(_CHAR_OCR_LANGUAGE, single_char=True))
+                    if api is None:
+                        break
+                    self._tesserocr_match_char(api, np.full((32, 32), 255, dtype=np.uint8))
+        except Exception:
+            pass
+
+    @classmethod
+    def _get_face_cascade(cls):
+        """Load the frontal-face cascade once, preferring the faster LBP model when shipped."""
+        if not cls._face_cascade_loaded:
+            cls._face_cascade_loaded = True
+            for name in _FACE_CASCADE_FILES:
+                path = os.path.join(cv2.data.haarcascades, name)
+                if not os.path.exists(path):
+                    continue
+                cascade = cv2.CascadeClassifier(path)
+                if not cascade.empty():
+                    cls._face_cascade = cascade
+                    break
+        return cls._face_cascade
+
+    @classmethod
+    def _get_skin_luts(cls):
+        """Per-channel 0/255 lookup tables for the HSV skin range, built once."""
+        if cls._skin_luts is None:
+            luts = []
+            for lower, upper in zip(_SKIN_LOWER_HSV, _SKIN_UPPER_HSV):
+                lut = np.zeros(256, dtype=np.uint8)
+                lut[lower:upper + 1] = 255
+                luts.append(lut)
+            cls._skin_luts = tuple(luts)
+        return cls._skin_luts
+
+    def _get_templates(self) -> tuple:
+        """Letter templates drawn once per process, as (letters, read-only (K, 32, 32) uint8 stack)."""
+        cls = type(self)
+        if cls._templates is None:
+            stack = np.stack([getattr(self, f'_create_{ch}_template')() for ch in _TEMPLATE_LETTERS])
+            stack.setflags(write=False)
+            cls._templates = (_TEMPLATE_LETTERS, stack)
+        return cls._templates
+
     def _try_multiple_ocr_configs(self, image: Image.Image, language: str) -> str:
         """Try multiple OCR configurations to improve recognition"""
         configs = [
-            '--psm 6 --oem 3',  # Uniform block of text
-            '--psm 8 --oem 3',  # Single word
-            '--psm 7 --oem 3',  # Single text line
-            '--psm 13 --oem 3', # Raw line
-            '--psm 3 --oem 3'   # Fully automatic
+            6,   # Uniform block of text
+            8,   # Single word
+            7,   # Single text line
+            13,  # Raw line
+            3    # Fully automatic
         ]
         
         best_text = ""
         best_confidence = 0
         
         # Try original and processed images
-        images_to_try = [
-            image,
-            self._preprocess_image(image),
-            self._preprocess_aggressive(image)
-        ]
+        images_to_try = [image] + self._preprocess_variants(image)
         
         for img in images_to_try:
-            for config in configs:
+            for psm in configs:
                 try:
-                    text = self.pytesseract.image_to_string(
-                        img, 
-                        lang=language,
-                        config=config
-                    ).strip()
+                    text = self._image_to_string(img, language, psm).strip()
                     
                     if text and len(text) > len(best_text):
                         best_text = text
@@ -271,7 +642,7 @@ class TesseractOCRProcessor:
         
         return best_text
 
-    def _ocr_with_tokens(self, image: Image.Image, language: str) -> Dict[str, Any]:
+    def _ocr_with_tokens(self, image: Image.Image, language: str, image_path: Optional[str] = None) -> Dict[str, Any]:
         """Run OCR across multiple configs and return best text with per-word tokens.
         Adds sparse-text modes, tries inverted images, and falls back to image_to_string when needed.
         """
@@ -279,14 +650,14 @@ class TesseractOCRProcessor:
             return {"text": "", "tokens": [], "mean_conf": 0.0}
         
         configs = [
-            '--psm 6 --oem 3',   # Uniform block of text
-            '--psm 4 --oem 3',   # Single column of text
-            '--psm 7 --oem 3',   # Single line
-            '--psm 8 --oem 3',   # Single word
-            '--psm 11 --oem 3',  # Sparse text
-            '--psm 12 --oem 3',  # Sparse text with OSD
-            '--psm 3 --oem 3',   # Auto
-            '--psm 13 --oem 3',  # Raw line
+            6,   # Uniform block of text
+            4,   # Single column of text
+            7,   # Single line
+            8,   # Single word
+            11,  # Sparse text
+            12,  # Sparse text with OSD
+            3,   # Auto
+            13,  # Raw line
         ]
         
         def _invert(pil_img: Image.Image) -> Image.Image:
@@ -303,133 +674,324 @@ class TesseractOCRProcessor:
             else:
                 return ImageOps.invert(pil_img.convert('RGB')).convert(pil_img.mode if pil_img.mode != 'RGB' else 'RGB')
         
-        images_to_try = [
-            image,
-            self._preprocess_image(image),
-            self._preprocess_aggressive(image)
-        ]
+        images_to_try = [image] + self._preprocess_variants(image)
         # Also try inverted versions (some preprocessors may produce white text on black background)
         images_to_try += [_invert(img) for img in images_to_try]
         
-        best = {"text": "", "tokens": [], "mean_conf": 0.0, "score": -1.0}
+        # PIL decodes lazily; make sure worker threads never race on the first load
+        image.load()
         
-        for img in images_to_try:
-            for config in configs:
+        # pytesseract re-encodes a PIL image to a temp PNG on every call; give it files
+        # instead - the upload itself and each variant written once for all configs
+        temp_paths: List[str] = []
+        sources: List[Any] = images_to_try
+        try:
+            if self.tesserocr is None:
+                sources = self._ocr_file_sources(images_to_try, image_path, temp_paths)
+            return self._ocr_sweep(image, sources, language, configs)
+        finally:
+            for path in temp_paths:
                 try:
-                    data = self.pytesseract.image_to_data(
-                        img,
-                        lang=language,
-                        config=config,
-                        output_type=self.pytesseract.Output.DICT
-                    )
-                    tokens = []
-                    n = len(data.get('text', []))
-                    for i in range(n):
-                        word = (data['text'][i] or '').strip()
-                        try:
-                            conf = float(data['conf'][i]) if data['conf'][i] not in (None, '', '-1') else -1.0
-                        except Exception:
-                            conf = -1.0
-                        if word and conf >= 0:
-                            tokens.append({
-                                "word": word,
-                                "conf": conf,
-                                "bbox": [int(data['left'][i]), int(data['top'][i]), int(data['width'][i]), int(data['height'][i])],
-                                "line_num": int(data.get('line_num', [1]*n)[i]) if 'line_num' in data else 1,
-                                "block_num": int(data.get('block_num', [1]*n)[i]) if 'block_num' in data else 1,
-                                "par_num": int(data.get('par_num', [1]*n)[i]) if 'par_num' in data else 1,
-                                "word_num": int(data.get('word_num', [i+1]*n)[i])
-                            })
-                    if not tokens:
-                        continue
-                    # Reconstruct text grouped by line to maintain reading order
-                    tokens_sorted = sorted(tokens, key=lambda t: (t['par_num'], t['line_num'], t['bbox'][0]))
-                    text_lines = []
-                    current_key = None
-                    current_line = []
-                    for t in tokens_sorted:
-                        key = (t['par_num'], t['line_num'])
-                        if current_key is None:
-                            current_key = key
-                        if key != current_key:
-                            text_lines.append(' '.join(w['word'] for w in current_line))
-                            current_line = []
-                            current_key = key
-                        current_line.append(t)
-                    if current_line:
-                        text_lines.append(' '.join(w['word'] for w in current_line))
-                    text = '\n'.join([ln.strip() for ln in text_lines if ln.strip()])
-                    mean_conf = sum(t['conf'] for t in tokens_sorted) / max(1, len(tokens_sorted))
-                    score = self._score_ocr_result(text.replace('\n', ' '), mean_conf)
-                    if score > best['score']:
-                        best = {"text": text, "tokens": tokens_sorted, "mean_conf": mean_conf, "score": score}
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _ocr_single(self, image: Image.Image, language: str, image_path: Optional[str] = None) -> Dict[str, Any]:
+        """One OCR pass (psm 6 on the untouched image) in the same shape as _ocr_with_tokens."""
+        empty = {"text": "", "tokens": [], "mean_conf": 0.0}
+        if not self.tesseract_available:
+            return empty
+        source = image
+        if self.tesserocr is None and image_path and image.format in _TESSERACT_FILE_FORMATS:
+            source = image_path
+        try:
+            attempt = self._ocr_attempt(source, language, 6)
+        except Exception:
+            return empty
+        if attempt is None:
+            return empty
+        return self._ocr_result(attempt)
+
+    def _ocr_file_sources(self, images: List[Image.Image], image_path: Optional[str], temp_paths: List[str]) -> List[str]:
+        """Write OCR variants to PNG once; reuse the original file when Tesseract can read it."""
+        sources = []
+        for idx, img in enumerate(images):
+            if idx == 0 and image_path and img.format in _TESSERACT_FILE_FORMATS:
+                sources.append(image_path)
+                continue
+            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
+                temp_paths.append(tmp.name)
+                img.save(tmp, format='PNG')
+            sources.append(tmp.name)
+        return sources
+
+    def _ocr_sweep(self, image: Image.Image, images_to_try: List[Any], language: str, configs: List[int]) -> Dict[str, Any]:
+        """Rank every (image variant, psm) OCR attempt and return the best text and tokens."""
+        jobs = [(img, psm) for img in images_to_try for psm in configs]
+        
+        # Similar-looking uploads tend to share a winning (variant, psm); try that first
+        cache_key = self._ocr_cache_key(image)
+        with self._best_config_lock:
+            cached = self._best_config_cache.get(cache_key)
+            if cached is not None:
+                self._best_config_cache.move_to_end(cache_key)
+        if cached is not None:
+            variant_idx, psm = cached
+            try:
+                attempt = self._ocr_attempt(images_to_try[variant_idx], language, psm)
+            except Exception:
+                attempt = None
+            if attempt is not None and attempt["score"] >= _CACHED_CONFIG_MIN_SCORE:
+                return self._ocr_result(attempt)
+        
+        best = {"text": "", "tokens": [], "mean_conf": 0.0, "score": -1.0}
+        best_rank = (-1.0, 0)
+        futures = {
+            _OCR_EXECUTOR.submit(self._ocr_attempt, img, language, psm): idx
+            for idx, (img, psm) in enumerate(jobs)
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    attempt = future.result()
                 except Exception:
                     continue
+                if attempt is None:
+                    continue
+                # Ties go to the earlier (image, psm) pair, as in the sequential sweep
+                rank = (attempt["score"], -futures[future])
+                if rank > best_rank:
+                    best, best_rank = attempt, rank
+                if best["mean_conf"] > _GOOD_ENOUGH_CONF and len(best["text"]) >= _GOOD_ENOUGH_MIN_CHARS:
+                    break
+        finally:
+            for future in futures:
+                future.cancel()
+        
+        if best["tokens"]:
+            winner = -best_rank[1]
+            with self._best_config_lock:
+                self._best_config_cache[cache_key] = (winner // len(configs), jobs[winner][1])
+                self._best_config_cache.move_to_end(cache_key)
+                while len(self._best_config_cache) > _BEST_CONFIG_CACHE_SIZE:
+                    self._best_config_cache.popitem(last=False)
         
         # Fallback: if we didn't get tokens with decent text, try image_to_string once
         if (not best["text"]) or (len(best["tokens"]) == 0):
             try:
-                fallback_text = self.pytesseract.image_to_string(self._preprocess_aggressive(image), lang=language, config='--psm 6 --oem 3').strip()
+                # images_to_try[2] is the aggressively preprocessed variant
+                fallback_text = self._image_to_string(images_to_try[2], language, 6).strip()
                 if fallback_text and len(fallback_text) > len(best["text"]):
                     best = {"text": fallback_text, "tokens": [], "mean_conf": 0.0, "score": self._score_ocr_result(fallback_text, 50.0)}
             except Exception:
                 pass
         
-        return {k: best[k] for k in ("text", "tokens", "mean_conf")}
+        return self._ocr_result(best)
+
+    def _ocr_cache_key(self, image: Image.Image) -> tuple:
+        """Coarse image signature (size buckets and mean intensity) for the best-config cache."""
+        width, height = image.size
+        mean_gray = float(np.mean(np.asarray(image.convert('L'))))
+        return (round(width / 100), round(height / 100), int(mean_gray / 16))
+
+    def _ocr_result(self, attempt: Dict[str, Any]) -> Dict[str, Any]:
+        """Public result shape for an attempt; only the winner's tokens are turned into dicts."""
+        return {
+            "text": attempt["text"],
+            "tokens": [t.as_dict() for t in attempt["tokens"]],
+            "mean_conf": attempt["mean_conf"]
+        }
+
+    def _ocr_attempt(self, img: Any, language: str, psm: int) -> Optional[Dict[str, Any]]:
+        """Run a single (image, psm) OCR pass and score it; None when no words were found."""
+        data = self._image_to_data(img, language, psm)
+        texts = data.get('text', [])
+        confs = data.get('conf', [])
+        n = len(texts)
+        line_nums = data.get('line_num') or [1] * n
+        block_nums = data.get('block_num') or [1] * n
+        par_nums = data.get('par_num') or [1] * n
+        word_nums = data.get('word_num') or range(1, n + 1)
+        tokens = []
+        for i in range(n):
+            word = (texts[i] or '').strip()
+            if not word:
+                continue
+            try:
+                conf = float(confs[i]) if confs[i] not in (None, '', '-1') else -1.0
+            except Exception:
+                conf = -1.0
+            if conf >= 0:
+                tokens.append(_OcrToken(
+                    word, conf,
+                    int(data['left'][i]), int(data['top'][i]), int(data['width'][i]), int(data['height'][i]),
+                    int(line_nums[i]), int(block_nums[i]), int(par_nums[i]), int(word_nums[i])
+                ))
+        if not tokens:
+            return None
+        # Reconstruct text grouped by line to maintain reading order
+        tokens_sorted = sorted(tokens, key=lambda t: (t.par_num, t.line_num, t.left))
+        text_lines = []
+        current_key = None
+        current_line = []
+        for t in tokens_sorted:
+            key = (t.par_num, t.line_num)
+            if current_key is None:
+                current_key = key
+            if key != current_key:
+                text_lines.append(' '.join(current_line))
+                current_line = []
+                current_key = key
+            current_line.append(t.word)
+        if current_line:
+            text_lines.append(' '.join(current_line))
+        text = '\n'.join([ln.strip() for ln in text_lines if ln.strip()])
+        mean_conf = sum(t.conf for t in tokens_sorted) / max(1, len(tokens_sorted))
+        score = self._score_ocr_result(text.replace('\n', ' '), mean_conf)
+        return {"text": text, "tokens": tokens_sorted, "mean_conf": mean_conf, "score": score}
+
+    @contextmanager
+    def _leased_tess_api(self, language: str, single_char: bool = False):
+        """Lease an in-process Tesseract API from the process-wide pool for the language.
+        ``single_char`` APIs live in their own pool, preset to single-character mode with the
+        letter whitelist. Yields None when tesserocr or the language data is unavailable (use pytesseract).
+        """
+        if self.tesserocr is None or language in _TESS_FAILED_LANGUAGES:
+            yield None
+            return
+        with _TESS_POOL_LOCK:
+            pool = _TESS_API_POOLS.setdefault(language + (':char' if single_char else ''), queue.LifoQueue())
+        try:
+            api = pool.get_nowait()
+        except queue.Empty:
+            api = None
+        if api is None:
+            try:
+                api = self.tesserocr.PyTessBaseAPI(lang=language, oem=self.tesserocr.OEM.DEFAULT)
+                if single_char:
+                    api.SetPageSegMode(self.tesserocr.PSM.SINGLE_CHAR)
+                    api.SetVariable("tessedit_char_whitelist", _CHAR_WHITELIST)
+            except Exception:
+                # Missing traineddata etc. - remember the failure and fall back to pytesseract
+                _TESS_FAILED_LANGUAGES.add(language)
+        if api is None:
+            yield None
+            return
+        healthy = False
+        try:
+            yield api
+            healthy = True
+        finally:
+            # An API that raised mid-recognition is discarded and recreated on demand
+            if healthy and pool.qsize() < _TESS_POOL_SIZE:
+                pool.put_nowait(api)
+            else:
+                api.End()
+
+    def _image_to_data(self, image: Any, language: str, psm: int) -> Dict[str, List[Any]]:
+        """Word-level OCR data in pytesseract's Output.DICT layout."""
+        with self._leased_tess_api(language) as api:
+            if api is not None:
+                return self._tesserocr_image_to_data(api, image, psm)
+        if self.pytesseract is None:
+            return {"text": [], "conf": []}
+        return self.pytesseract.image_to_data(
+            image,
+            lang=language,
+            config=f'--psm {psm} --oem 3',
+            output_type=self.pytesseract.Output.DICT
+        )
+
+    def _tesserocr_image_to_data(self, api, image: Image.Image, psm: int) -> Dict[str, List[Any]]:
+        """Run recognition on a leased PyTessBaseAPI and collect per-word results."""
+        RIL = self.tesserocr.RIL
+        api.SetPageSegMode(psm)
+        api.SetImage(image)
+        api.Recognize()
+        data = {key: [] for key in ("text", "conf", "left", "top", "width", "height",
+                                    "block_num", "par_num", "line_num", "word_num")}
+        ri = api.GetIterator()
+        if ri is None:
+            return data
+        block_num = par_num = line_num = word_num = 0
+        for r in self.tesserocr.iterate_level(ri, RIL.WORD):
+            if r.IsAtBeginningOf(RIL.BLOCK):
+                block_num += 1
+                par_num = 0
+            if r.IsAtBeginningOf(RIL.PARA):
+                par_num += 1
+                line_num = 0
+            if r.IsAtBeginningOf(RIL.TEXTLINE):
+                line_num += 1
+                word_num = 0
+            word_num += 1
+            bbox = r.BoundingBox(RIL.WORD)
+            if bbox is None:
+                continue
+            x1, y1, x2, y2 = bbox
+            data["text"].append(r.GetUTF8Text(RIL.WORD) or "")
+            data["conf"].append(r.Confidence(RIL.WORD))
+            data["left"].append(x1)
+            data["top"].append(y1)
+            data["width"].append(x2 - x1)
+            data["height"].append(y2 - y1)
+            data["block_num"].append(block_num)
+            data["par_num"].append(par_num)
+            data["line_num"].append(line_num)
+            data["word_num"].append(word_num)
+        return data
+
+    def _image_to_string(self, image: Any, language: str, psm: int) -> str:
+        """Plain-text OCR using the in-process API when available."""
+        with self._leased_tess_api(language) as api:
+            if api is not None:
+                api.SetPageSegMode(psm)
+                api.SetImage(image)
+                return api.GetUTF8Text() or ""
+        if self.pytesseract is None:
+            return ""
+        return self.pytesseract.image_to_string(image, lang=language, config=f'--psm {psm} --oem 3')
 
     def _score_ocr_result(self, text: str, mean_conf: float) -> float:
         """Score an OCR attempt: prefer longer sensible text with higher confidence."""
         if not text:
             return -1.0
-        words = [w for w in text.split() if w]
-        if not words:
+        # Single scan: str.split() never yields empty words
+        n_words = 0
+        n_alpha = 0
+        for w in text.split():
+            n_words += 1
+            if not w.isdigit() and any(ch.isalpha() for ch in w):
+                n_alpha += 1
+        if not n_words:
             return -1.0
-        alpha_ratio = sum(1 for w in words if any(ch.isalpha() for ch in w)) / len(words)
         length_bonus = min(len(text) / 100.0, 1.0)
-        return 0.6 * (mean_conf / 100.0) + 0.3 * alpha_ratio + 0.1 * length_bonus
+        return 0.6 * (mean_conf / 100.0) + 0.3 * (n_alpha / n_words) + 0.1 * length_bonus
 
-    def _assemble_text_from_characters(self, characters: List[Dict[str, Any]]) -> str:
+    def _assemble_text_from_characters(self, characters: List[Dict[str, Any]], table: Optional[_CharacterTable] = None) -> str:
         """Assemble text from detected character boxes by grouping into lines and sorting left-to-right.
         Useful when image_to_data finds no tokens but characters are clearly segmented.
         """
         if not characters:
             return ""
         try:
-            # Group by approximate line using y-center; allow small tolerance
-            import math
-            chars = [c for c in characters if c.get('bbox')]
-            if not chars:
+            if table is None:
+                table = _CharacterTable.from_characters([c for c in characters if c.get('bbox')])
+            if not table.letters:
                 return ""
-            # Compute line groups
-            lines: List[List[Dict[str, Any]]] = []
-            y_centers = []
-            for c in sorted(chars, key=lambda ch: ch['bbox'][1]):
-                x, y, w, h = c['bbox']
-                cy = y + h / 2.0
-                placed = False
-                for idx, yc in enumerate(y_centers):
-                    if abs(cy - yc) <= max(h, 18):  # tolerance based on character height
-                        lines[idx].append(c)
-                        # Update running average for the line center
-                        y_centers[idx] = (y_centers[idx] * (len(lines[idx]) - 1) + cy) / len(lines[idx])
-                        placed = True
-                        break
-                if not placed:
-                    lines.append([c])
-                    y_centers.append(cy)
-            # Sort lines by y and chars in each line by x
+            # Group by approximate line: sort by y-center and start a new line wherever
+            # the gap to the previous center exceeds the character-height tolerance
+            bb = table.bboxes.astype(np.float64)
+            cy = bb[:, 1] + bb[:, 3] / 2.0
+            order = np.argsort(cy, kind='stable')
+            tolerance = np.maximum(bb[order[1:], 3], 18)
+            breaks = np.flatnonzero(np.diff(cy[order]) > tolerance) + 1
             assembled_lines: List[str] = []
-            for line in sorted(lines, key=lambda lst: lst[0]['bbox'][1]):
-                line_sorted = sorted(line, key=lambda ch: ch['bbox'][0])
-                letters: List[str] = []
-                for ch in line_sorted:
-                    matches = ch.get('template_matches') or []
-                    if matches:
-                        letters.append(matches[0].get('letter', '') or '')
-                    else:
-                        letters.append('')
+            for line in np.split(order, breaks):
+                # Chars in each line left-to-right
+                line_sorted = line[np.argsort(bb[line, 0], kind='stable')]
                 # Merge letters to string; collapse multiple empties
-                word = ''.join(letters)
+                word = ''.join([table.letters[idx] for idx in line_sorted.tolist()])
                 assembled_lines.append(word.strip())
             # Join lines; filter empties
             text = '\n'.join([ln for ln in assembled_lines if ln])
@@ -445,13 +1007,9 @@ class TesseractOCRProcessor:
         if not characters or not tokens:
             return mapped
         
-        # Precompute token centers and line ranges
-        def center_of(bbox):
-            x, y, w, h = bbox
-            return (x + w/2.0, y + h/2.0)
+        from collections import defaultdict
         
         # Group tokens by line for better alignment
-        from collections import defaultdict
         line_to_indices = defaultdict(list)
         for idx, t in enumerate(tokens):
             line_to_indices[t.get('line_num', 1)].append(idx)
@@ -462,40 +1020,27 @@ class TesseractOCRProcessor:
             for local_pos, i in enumerate(idxs):
                 tokens[i]['_line_pos'] = local_pos
         
-        # Map each character to nearest token on same line (by y overlap) or containing bbox
-        for char in sorted(characters, key=lambda c: c.get('bbox', [0,0,0,0])[0]):
-            cb = char.get('bbox', [0,0,0,0])
-            cx, cy = center_of(cb)
-            best_word = -1
-            best_dist = float('inf')
-            best_char_index = 0
-            # Try direct containment first
-            for wi, t in enumerate(tokens):
-                x, y, w, h = t['bbox']
-                if x <= cx <= x + w and y <= cy <= y + h:
-                    best_word = wi
-                    break
-            if best_word == -1:
-                # Choose token with minimal vertical distance, then horizontal distance
-                for wi, t in enumerate(tokens):
-                    x, y, w, h = t['bbox']
-                    # Vertical distance: 0 if overlapping
-                    if (y <= cy <= y + h) or (cy <= y + h and cy >= y):
-                        vdist = 0
-                    else:
-                        vdist = min(abs(cy - y), abs(cy - (y + h)))
-                    hdist = 0 if (x <= cx <= x + w) else min(abs(cx - x), abs(cx - (x + w)))
-                    dist = vdist * 2 + hdist
-                    if dist < best_dist:
-                        best_dist = dist
-                        best_word = wi
-            if best_word == -1:
-                continue
-            
-            # Estimate character index inside the word by relative x ordering among chars assigned to that word
+        chars = sorted(characters, key=lambda c: c.get('bbox', [0,0,0,0])[0])
+        
+        # Token boxes as (W, 4) [x0, y0, x1, y1] and character centers as (C, 1) columns
+        tk = np.array([t['bbox'] for t in tokens], dtype=np.float64).reshape(-1, 4)
+        tk[:, 2] += tk[:, 0]
+        tk[:, 3] += tk[:, 1]
+        cb = np.array([c.get('bbox', [0,0,0,0]) for c in chars], dtype=np.float64).reshape(-1, 4)
+        cx = (cb[:, 0] + cb[:, 2] / 2.0)[:, None]
+        cy = (cb[:, 1] + cb[:, 3] / 2.0)[:, None]
+        
+        # (C, W) distances; zero when the center lies inside the token span
+        vdist = np.maximum(0.0, np.maximum(tk[:, 1] - cy, cy - tk[:, 3]))
+        hdist = np.maximum(0.0, np.maximum(tk[:, 0] - cx, cx - tk[:, 2]))
+        contained = (vdist == 0) & (hdist == 0)
+        # Prefer the first containing token, else the nearest (vertical distance weighted double)
+        word_idx = np.where(contained.any(axis=1), contained.argmax(axis=1), (vdist * 2 + hdist).argmin(axis=1))
+        
+        for char, best_word in zip(chars, word_idx.tolist()):
             mapped.append({
                 "word_index": best_word,
-                "char_bbox": cb,
+                "char_bbox": char.get('bbox', [0,0,0,0]),
                 "template_matches": char.get("template_matches", []),
                 "errors": char.get("errors", []),
             })
@@ -546,77 +1091,85 @@ class TesseractOCRProcessor:
             })
         return feedback
     
-    def _preprocess_aggressive(self, image: Image.Image) -> Image.Image:
-        """More aggressive preprocessing for difficult images"""
-        from PIL import ImageEnhance, ImageFilter
-        import numpy as np
-        
+    def _preprocess_shared(self, image: Image.Image, min_side: int) -> Image.Image:
+        """Grayscale conversion and upscaling common to both preprocessors"""
         if image.mode != 'L':
             image = image.convert('L')
         
-        # Resize larger
         width, height = image.size
-        if width < 600 or height < 600:
-            scale = max(600/width, 600/height)
+        if width < min_side or height < min_side:
+            scale = max(min_side/width, min_side/height)
             image = image.resize((int(width*scale), int(height*scale)))
+        return image
+
+    def _preprocess_variants(self, image: Image.Image) -> List[Image.Image]:
+        """Basic and aggressive preprocessing, converting to grayscale only once"""
+        gray = image if image.mode == 'L' else image.convert('L')
+        return [self._preprocess_image(gray), self._preprocess_aggressive(gray)]
+
+    def _preprocess_aggressive(self, image: Image.Image) -> Image.Image:
+        """More aggressive preprocessing for difficult images"""
+        # Resize larger
+        image = self._preprocess_shared(image, 600)
+        img_array = np.asarray(image)
         
         # Enhance more aggressively
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(3.0)
+        img_array = self._enhance_contrast(img_array, 3.0)
         
-        enhancer = ImageEnhance.Sharpness(image)
-        image = enhancer.enhance(2.0)
+        # Sharpness 2.0 (as PIL's ImageEnhance.Sharpness): 2 * image - ImageFilter.SMOOTH(image)
+        kernel = np.full((3, 3), 1 / 13, dtype=np.float32)
+        kernel[1, 1] = 5 / 13
+        smooth = cv2.filter2D(img_array, -1, kernel, borderType=cv2.BORDER_REPLICATE)
+        img_array = cv2.addWeighted(img_array, 2.0, smooth, -1.0, 0)
         
         # Apply different threshold
-        img_array = np.array(image)
         threshold = np.percentile(img_array, 50)  # Use median as threshold
-        img_array = np.where(img_array > threshold, 255, 0).astype(np.uint8)
+        _, img_array = cv2.threshold(img_array, threshold, 255, cv2.THRESH_BINARY)
         
         return Image.fromarray(img_array)
 
     def _preprocess_image(self, image: Image.Image) -> Image.Image:
         """Basic image preprocessing"""
-        from PIL import ImageEnhance
-        import numpy as np
-        
-        if image.mode != 'L':
-            image = image.convert('L')
+        image = self._preprocess_shared(image, 300)
+        img_array = self._enhance_contrast(np.asarray(image), 2.0)
         
-        width, height = image.size
-        if width < 300 or height < 300:
-            scale = max(300/width, 300/height)
-            image = image.resize((int(width*scale), int(height*scale)))
-        
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(2.0)
-        
-        img_array = np.array(image)
         threshold = np.mean(img_array)
-        img_array = np.where(img_array > threshold, 255, 0).astype(np.uint8)
+        _, img_array = cv2.threshold(img_array, threshold, 255, cv2.THRESH_BINARY)
         
         return Image.fromarray(img_array)
 
-    def _analyze_characters(self, image_path: str) -> Dict[str, Any]:
-        """Enhanced character analysis with curve and stroke detection"""
+    def _enhance_contrast(self, gray, factor: float):
+        """Contrast stretch around the mean, matching PIL's ImageEnhance.Contrast, in one uint8 pass"""
+        mean = int(gray.mean() + 0.5)
+        return cv2.addWeighted(gray, factor, gray, 0.0, mean * (1.0 - factor))
+
+    def _analyze_characters(self, image_path: str, gray=None) -> Dict[str, Any]:
+        """Enhanced character analysis with curve and stroke detection.
+        Pass an already decoded grayscale array as ``gray`` to skip re-reading the file.
+        """
+        return self._segment_characters(image_path, gray)[0]
+    
+    def _segment_characters(self, image_path: str, gray=None) -> tuple:
+        """Character analysis plus the same characters as a _CharacterTable.
+        Results are collected column-wise; the per-character dicts are only built for the response.
+        """
+        empty = _CharacterTable.from_characters([])
         try:
-            import cv2
-            import numpy as np
-            
             # Check if OpenCV can read the image
-            img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+            img = gray if gray is not None else cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
             if img is None:
                 # Fallback: try with PIL and convert
                 try:
                     pil_img = Image.open(image_path).convert('L')
                     img = np.array(pil_img)
                 except:
-                    return {"characters": [], "error": "Could not load image"}
+                    return {"characters": [], "error": "Could not load image"}, empty
             
             # Build robust binary mask for character segmentation
             try:
-                # Otsu both normal and inverted
-                _, bin_inv = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+                # Otsu once; the inverted mask is the exact complement of the normal one
                 _, bin_norm = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+                bin_inv = cv2.bitwise_not(bin_norm)
             except:
                 thr = np.mean(img)
                 bin_inv = np.where(img < thr, 255, 0).astype(np.uint8)
@@ -643,44 +1196,36 @@ class TesseractOCRProcessor:
             proc = cv2.dilate(binary, kernel, iterations=1)
             proc = cv2.morphologyEx(proc, cv2.MORPH_OPEN, kernel, iterations=1)
             
-            # Find contours
+            # Label components; boxes and pixel areas for all of them come from one pass
             try:
-                contours, _ = cv2.findContours(proc, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+                _, labels, stats, _ = cv2.connectedComponentsWithStats(proc, connectivity=8, ltype=cv2.CV_32S)
             except:
-                return {"characters": [], "error": "Could not find contours"}
+                return {"characters": [], "error": "Could not find contours"}, empty
+            
+            # Letters for template matching are read off the page once, not per crop
+            page_letters = self._page_letter_boxes(img) if self.tesseract_available else None
             
-            characters = []
+            bboxes, features_list, matches_list, errors_list = [], [], [], []
+            unmatched = []
             img_h, img_w = img.shape[:2]
             min_area = max(20, int(0.00005 * img_w * img_h))
             max_area = int(0.1 * img_w * img_h)
-            char_id = 0
             
             def split_wide_bbox(x, y, w, h, src_mask):
                 # Split very wide components into probable letters using vertical projection
                 if w <= h * 1.8:
                     return [(x, y, w, h)]
-                roi = src_mask[y:y+h, x:x+w]
-                proj = roi.sum(axis=0)
-                # Find valleys to split
-                import numpy as np
-                thresh = np.percentile(proj, 30)
-                cuts = []
-                in_gap = False
-                start = 0
-                segments = []
-                for i, val in enumerate(proj):
-                    if val <= thresh and not in_gap:
-                        in_gap = True
-                        if i - start > 5:
-                            segments.append((start, i))
-                    elif val > thresh and in_gap:
-                        in_gap = False
-                        start = i
+                # Ink pixels per column; the mask is 0/255, so this is the old
+                # column sum divided by 255 and picks the same valleys
+                proj = np.count_nonzero(src_mask[y:y+h, x:x+w], axis=0).astype(np.int32)
+                # Projections are integers, so flooring the percentile keeps "val <= thresh" unchanged
+                thresh = int(np.percentile(proj, 30))
+                segments = _find_valleys(proj, thresh, 5)
                 if len(segments) < 1:
                     return [(x, y, w, h)]
                 boxes = []
                 prev = 0
-                for (s, e) in segments:
+                for (s, e) in segments.tolist():
                     ww = s - prev
                     if ww > 5:
                         boxes.append((x+prev, y, ww, h))
@@ -689,47 +1234,77 @@ class TesseractOCRProcessor:
                     boxes.append((x+prev, y, w-prev, h))
                 return boxes if boxes else [(x, y, w, h)]
             
-            for contour in contours:
+            areas = stats[:, cv2.CC_STAT_AREA]
+            keep = ((areas >= min_area) & (areas <= max_area)
+                    & (stats[:, cv2.CC_STAT_WIDTH] >= 5) & (stats[:, cv2.CC_STAT_HEIGHT] >= 5))
+            keep[0] = False  # background
+            
+            for label in np.flatnonzero(keep).tolist():
                 try:
-                    area = cv2.contourArea(contour)
-                    if area < min_area or area > max_area:
-                        continue
-                    x, y, w, h = cv2.boundingRect(contour)
-                    if w < 5 or h < 5:
+                    x, y, w, h = stats[label, :4].tolist()
+                    # Shape features still need a contour, traced on the component's own crop only
+                    component = cv2.compare(labels[y:y+h, x:x+w], label, cv2.CMP_EQ)
+                    contours, _ = cv2.findContours(component, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+                    if not contours:
                         continue
+                    contour = max(contours, key=len)
                     # Optionally split very wide components
                     parts = split_wide_bbox(x, y, w, h, proc)
                     for (px, py, pw, ph) in parts:
                         char_img = proc[py:py+ph, px:px+pw]
-                        features = self._extract_geometric_features_safe(contour, char_img)
-                        matches = self._enhanced_template_match_safe(char_img, features)
-                        errors = self._analyze_character_errors_safe(char_img, features)
-                        characters.append({
-                            "id": char_id,
-                            "bbox": [px, py, pw, ph],
-                            "features": features,
-                            "template_matches": matches,
-                            "errors": errors
-                        })
-                        char_id += 1
+                        matches = []
+                        if page_letters is not None:
+                            matches = self._enhanced_template_match_safe(char_img, None, (px, py, pw, ph), page_letters)
+                        if matches and matches[0]["confidence"] > _CONFIDENT_MATCH:
+                            # OCR is sure of the letter; skip the shape analysis behind error feedback
+                            features = {"area": float(cv2.countNonZero(char_img)), "aspect_ratio": pw / ph}
+                            errors = _EMPTY_ERRORS
+                        else:
+                            if not matches:
+                                # OCR'd below, together with everything else the page pass missed
+                                unmatched.append((len(bboxes), char_img))
+                            features = self._extract_geometric_features_safe(contour, char_img)
+                            errors = self._analyze_character_errors_safe(char_img, features)
+                        bboxes.append([px, py, pw, ph])
+                        features_list.append(features)
+                        matches_list.append(matches)
+                        errors_list.append(errors)
                 except Exception:
                     continue
             
+            if unmatched:
+                crop_matches = self._match_crops([crop for _, crop in unmatched])
+                for (idx, _), matches in zip(unmatched, crop_matches):
+                    matches_list[idx] = matches
+            
+            table = _CharacterTable.build(bboxes, matches_list, errors_list)
+            
             # Generate visual overlay (optional, don't fail if it doesn't work)
             overlay_path = ""
             try:
-                overlay_path = self._generate_visual_overlay(image_path, {"characters": characters})
+                overlay_path = self._generate_visual_overlay(image_path, None, size=(img_w, img_h), table=table)
             except:
                 pass
             
+            characters = [
+                {
+                    "id": char_id,
+                    "bbox": bbox,
+                    "features": features,
+                    "template_matches": matches,
+                    "errors": errors
+                }
+                for char_id, (bbox, features, matches, errors)
+                in enumerate(zip(bboxes, features_list, matches_list, errors_list))
+            ]
             return {
                 "characters": characters,
                 "total_found": len(characters),
                 "visual_overlay_path": overlay_path
-            }
+            }, table
             
         except Exception as e:
-            return {"characters": [], "error": f"Character analysis failed: {str(e)}"}
+            return {"characters": [], "error": f"Character analysis failed: {str(e)}"}, empty
     
     def _extract_geometric_features_safe(self, contour, char_img) -> Dict[str, Any]:
         """Safe version of geometric feature extraction"""
@@ -737,21 +1312,117 @@ class TesseractOCRProcessor:
             return self._extract_geometric_features(contour, char_img)
         except:
             # Return basic features if detailed analysis fails
-            return {
-                "area": 100,
-                "aspect_ratio": 1.0,
-                "has_loops": False,
-                "has_curves": False,
-                "stroke_count": 1
-            }
+            return dict(_DEFAULT_FEATURES)
     
-    def _enhanced_template_match_safe(self, char_img, features) -> List[Dict[str, Any]]:
-        """Safe version of template matching"""
+    def _enhanced_template_match_safe(self, char_img, features, bbox: Optional[tuple] = None,
+                                      page_letters: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Safe version of template matching; uses the page-level OCR letters when given"""
         try:
+            if page_letters is not None and bbox is not None:
+                return self._match_page_letters(bbox, page_letters)
             return self._enhanced_template_match(char_img, features)
         except:
             return [{"letter": "?", "confidence": 0.1, "reasoning": "Could not analyze"}]
     
+    def _match_crops(self, crops: List[Any]) -> List[List[Dict[str, Any]]]:
+        """Single-character OCR for several crops. Without tesserocr, all crops go through
+        one Tesseract process instead of one process each."""
+        if self.tesserocr is None and self.pytesseract is not None:
+            try:
+                return self._batch_ocr_crops(crops)
+            except Exception:
+                pass
+        return [self._enhanced_template_match_safe(crop, {}) for crop in crops]
+    
+    def _batch_ocr_crops(self, crops: List[Any]) -> List[List[Dict[str, Any]]]:
+        """Run the Tesseract binary once over an image list of crops (one page per crop)
+        and return the top-3 letter matches per crop."""
+        results = [[] for _ in crops]
+        with tempfile.TemporaryDirectory(prefix="lexi_batch_") as tmp:
+            paths = []
+            for i, crop in enumerate(crops):
+                # Uncompressed PGM: crops are tiny and PNG encoding would dominate
+                path = os.path.join(tmp, f"c{i}.pgm")
+                if not cv2.imwrite(path, crop):
+                    raise RuntimeError("Could not write character crop")
+                paths.append(path)
+            list_path = os.path.join(tmp, "list.txt")
+            with open(list_path, 'w') as f:
+                f.write('\n'.join(paths) + '\n')
+            proc = subprocess.run(
+                [self.pytesseract.pytesseract.tesseract_cmd, list_path, 'stdout', '--psm', '10',
+                 '-c', f'tessedit_char_whitelist={_CHAR_WHITELIST}', 'tsv'],
+                capture_output=True, text=True, check=True
+            )
+        rows = proc.stdout.splitlines()
+        header = rows[0].split('\t') if rows else []
+        col = {name: i for i, name in enumerate(header)}
+        for row in rows[1:]:
+            fields = row.split('\t')
+            if len(fields) != len(header) or fields[col['level']] != '5':
+                continue
+            char = fields[col['text']].strip()
+            conf = float(fields[col['conf']])
+            page = int(fields[col['page_num']]) - 1
+            if char and conf > _CHAR_MATCH_MIN_CONF and 0 <= page < len(results):
+                results[page].append({
+                    "letter": char.lower(),
+                    "confidence": conf / 100.0,
+                    "reasoning": f"OCR recognition of '{char}'"
+                })
+        return [sorted(matches, key=lambda x: x["confidence"], reverse=True)[:3] for matches in results]
+    
+    def _page_letter_boxes(self, img) -> Optional[tuple]:
+        """Run one sparse-text OCR pass over the page and split each word into letter cells.
+        Returns (x1, y1, x2, y2 boxes, confidences, letters), or None if OCR failed.
+        """
+        try:
+            data = self._image_to_data(Image.fromarray(img), _CHAR_OCR_LANGUAGE, _CHAR_OCR_PSM)
+        except Exception:
+            return None
+        boxes, confs, letters = [], [], []
+        for i, word in enumerate(data.get('text', [])):
+            word = (word or '').strip()
+            try:
+                conf = float(data['conf'][i])
+            except (TypeError, ValueError):
+                continue
+            if not word or conf <= _CHAR_MATCH_MIN_CONF:
+                continue
+            left, top = int(data['left'][i]), int(data['top'][i])
+            height = int(data['height'][i])
+            # Tesseract reports word boxes; assume an even letter pitch inside each word
+            pitch = int(data['width'][i]) / len(word)
+            for j, ch in enumerate(word):
+                if ch in string.ascii_letters:
+                    boxes.append((left + j * pitch, top, left + (j + 1) * pitch, top + height))
+                    confs.append(conf)
+                    letters.append(ch)
+        return np.array(boxes, dtype=np.float64).reshape(-1, 4), np.array(confs, dtype=np.float64), letters
+    
+    def _match_page_letters(self, bbox: tuple, page_letters: tuple) -> List[Dict[str, Any]]:
+        """Top-3 page OCR letters overlapping the character box, by confidence"""
+        boxes, confs, letters = page_letters
+        if not letters:
+            return []
+        x, y, w, h = bbox
+        iw = np.minimum(boxes[:, 2], x + w) - np.maximum(boxes[:, 0], x)
+        ih = np.minimum(boxes[:, 3], y + h) - np.maximum(boxes[:, 1], y)
+        inter = np.clip(iw, 0, None) * np.clip(ih, 0, None)
+        union = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]) + w * h - inter
+        hits = np.flatnonzero(inter >= _CHAR_MATCH_MIN_IOU * np.maximum(union, 1e-9))
+        if hits.size == 0:
+            return []
+        best = hits[np.argsort(-confs[hits], kind='stable')[:3]]
+        return [
+            {
+                "letter": letters[i].lower(),
+                "confidence": float(confs[i]) / 100.0,
+                "reasoning": f"OCR recognition of '{letters[i]}'"
+            }
+            for i in best
+        ]
+    
     def _analyze_character_errors_safe(self, char_img, features) -> List[Dict[str, str]]:
         """Safe version of error analysis"""
         try:
@@ -761,8 +1432,9 @@ class TesseractOCRProcessor:
     
     def _detect_loops(self, char_img) -> bool:
         """Simple loop detection"""
+        if char_img.size == 0:
+            return False
         try:
-            import cv2
             contours, hierarchy = cv2.findContours(char_img, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
             if hierarchy is not None:
                 for i, h in enumerate(hierarchy[0]):
@@ -774,20 +1446,21 @@ class TesseractOCRProcessor:
     
     def _extract_geometric_features(self, contour, char_img) -> Dict[str, Any]:
         """Extract detailed geometric features for character analysis"""
-        import cv2
-        import numpy as np
-        
+        # Empty crops get the basic features without going through an exception
+        if char_img.size == 0:
+            return dict(_DEFAULT_FEATURES)
         area = cv2.contourArea(contour)
         perimeter = cv2.arcLength(contour, True)
+        has_loops, stroke_count = self._contour_topology(char_img)
         
         features = {
             "area": area,
             "perimeter": perimeter,
             "aspect_ratio": char_img.shape[1] / char_img.shape[0] if char_img.shape[0] > 0 else 0,
             "circularity": 4 * np.pi * area / (perimeter * perimeter) if perimeter > 0 else 0,
-            "has_loops": self._detect_loops(char_img),
+            "has_loops": has_loops,
             "has_curves": self._detect_curves(contour),
-            "stroke_count": self._count_strokes(char_img),
+            "stroke_count": stroke_count,
             "is_closed": self._is_shape_closed(contour)
         }
         
@@ -798,65 +1471,102 @@ class TesseractOCRProcessor:
         
         return features
     
+    def _contour_topology(self, char_img) -> tuple:
+        """(has_loops, stroke_count) from one contour tree instead of separate
+        _detect_loops and _count_strokes passes over the crop"""
+        contours, hierarchy = cv2.findContours(char_img, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        if hierarchy is None:
+            return False, 0
+        parents = hierarchy[0][:, 3].tolist()
+        has_loops = False
+        stroke_count = 0
+        for i, contour in enumerate(contours):
+            depth = 0
+            parent = parents[i]
+            while parent != -1:
+                depth += 1
+                parent = parents[parent]
+            # Even depths are outer boundaries of ink, odd depths are holes
+            if depth == 0:
+                if cv2.contourArea(contour) > 10:
+                    stroke_count += 1
+            elif depth % 2 == 1 and not has_loops:
+                has_loops = cv2.contourArea(contour) > 20
+        return has_loops, stroke_count
+    
     def _detect_curves(self, contour) -> bool:
         """Detect significant curves in character contour"""
-        import cv2
         epsilon = 0.02 * cv2.arcLength(contour, True)
         approx = cv2.approxPolyDP(contour, epsilon, True)
         return len(approx) > 6  # More vertices suggest curves
     
     def _count_strokes(self, char_img) -> int:
         """Count number of separate strokes in character"""
-        import cv2
         contours, _ = cv2.findContours(char_img, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         return len([c for c in contours if cv2.contourArea(c) > 10])
     
     def _is_shape_closed(self, contour) -> bool:
         """Check if character shape is closed"""
-        import cv2
         return cv2.isContourConvex(contour) or len(contour) > 20
     
     def _enhanced_template_match(self, char_img, features) -> List[Dict[str, Any]]:
         """OCR-based character recognition instead of template matching"""
+        if char_img.shape[0] == 0 or char_img.shape[1] == 0:
+            return []
+        
+        with self._leased_tess_api(_CHAR_OCR_LANGUAGE, single_char=True) as api:
+            if api is not None:
+                return self._tesserocr_match_char(api, char_img)
+        
+        if self.pytesseract is None:
+            # Fallback to simple template matching if Tesseract not available
+            return []
+        
+        # Convert to PIL Image for Tesseract
+        pil_img = Image.fromarray(char_img)
+        
+        # Use Tesseract to recognize single character
+        config = f'--psm 10 -c tessedit_char_whitelist={_CHAR_WHITELIST}'
+        
         try:
-            import pytesseract
-            from PIL import Image
-            import numpy as np
-            
-            if char_img.shape[0] == 0 or char_img.shape[1] == 0:
-                return []
+            # Get character and confidence from Tesseract
+            data = self.pytesseract.image_to_data(pil_img, config=config, output_type=self.pytesseract.Output.DICT)
             
-            # Convert to PIL Image for Tesseract
-            pil_img = Image.fromarray(char_img)
+            matches = []
+            for i in range(len(data['text'])):
+                char = data['text'][i].strip()
+                conf = float(data['conf'][i]) if data['conf'][i] not in (None, '', '-1') else 0
+                
+                if char and conf > _CHAR_MATCH_MIN_CONF:  # Very low threshold
+                    matches.append({
+                        "letter": char.lower(),
+                        "confidence": conf / 100.0,
+                        "reasoning": f"OCR recognition of '{char}'"
+                    })
             
-            # Use Tesseract to recognize single character
-            config = '--psm 10 -c tessedit_char_whitelist=abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+            return sorted(matches, key=lambda x: x["confidence"], reverse=True)[:3]
             
-            try:
-                # Get character and confidence from Tesseract
-                data = pytesseract.image_to_data(pil_img, config=config, output_type=pytesseract.Output.DICT)
-                
-                matches = []
-                for i in range(len(data['text'])):
-                    char = data['text'][i].strip()
-                    conf = float(data['conf'][i]) if data['conf'][i] not in (None, '', '-1') else 0
-                    
-                    if char and conf > 10:  # Very low threshold
-                        matches.append({
-                            "letter": char.lower(),
-                            "confidence": conf / 100.0,
-                            "reasoning": f"OCR recognition of '{char}'"
-                        })
-                
-                return sorted(matches, key=lambda x: x["confidence"], reverse=True)[:3]
-                
-            except:
-                return []
-                
-        except ImportError:
-            # Fallback to simple template matching if Tesseract not available
+        except:
             return []
     
+    def _tesserocr_match_char(self, api, char_img) -> List[Dict[str, Any]]:
+        """Single-character recognition on a leased single_char PyTessBaseAPI"""
+        # Raw 8-bit pixels go straight in; no PIL image or encoding step
+        char_img = np.ascontiguousarray(char_img, dtype=np.uint8)
+        height, width = char_img.shape[:2]
+        # Page segmentation mode and whitelist were set when the API was created
+        api.SetImageBytes(char_img.tobytes(), width, height, 1, width)
+        api.Recognize()
+        char = (api.GetUTF8Text() or '').strip()
+        conf = float(api.MeanTextConf())
+        if not char or conf <= _CHAR_MATCH_MIN_CONF:
+            return []
+        return [{
+            "letter": char.lower(),
+            "confidence": conf / 100.0,
+            "reasoning": f"OCR recognition of '{char}'"
+        }]
+    
     def _get_match_reasoning(self, letter: str, features: Dict) -> str:
         """Generate detailed reasoning for template matches"""
         has_loop = features.get("has_loops", False)
@@ -876,10 +1586,21 @@ class TesseractOCRProcessor:
     
     def _analyze_character_errors(self, char_img, features: Dict) -> List[Dict[str, str]]:
         """Analyze per-character errors and provide specific feedback"""
+        has_curves = features.get("has_curves")
+        has_loops = features.get("has_loops")
+        circularity = features.get("circularity", 0)
+        aspect_ratio = features.get("aspect_ratio", 1.0)
+        stroke_count = features.get("stroke_count", 1)
+        
+        # Most well-formed characters trip none of the checks below
+        if not ((has_curves and circularity < 0.3) or (not has_loops and circularity > 0.6)
+                or aspect_ratio > 2.5 or aspect_ratio < 0.3 or stroke_count > 2):
+            return _EMPTY_ERRORS
+        
         errors = []
         
         # Check for incomplete curves
-        if features.get("has_curves") and features.get("circularity", 0) < 0.3:
+        if has_curves and circularity < 0.3:
             errors.append({
                 "type": "incomplete_curve",
                 "description": "Curve appears incomplete or irregular",
@@ -887,7 +1608,7 @@ class TesseractOCRProcessor:
             })
         
         # Check for unclosed loops
-        if not features.get("has_loops") and features.get("circularity", 0) > 0.6:
+        if not has_loops and circularity > 0.6:
             errors.append({
                 "type": "unclosed_loop",
                 "description": "Loop may not be properly closed",
@@ -895,7 +1616,6 @@ class TesseractOCRProcessor:
             })
         
         # Check aspect ratio issues
-        aspect_ratio = features.get("aspect_ratio", 1.0)
         if aspect_ratio > 2.5:
             errors.append({
                 "type": "flipped_letter",
@@ -910,7 +1630,7 @@ class TesseractOCRProcessor:
             })
         
         # Check for broken strokes
-        if features.get("stroke_count", 1) > 2:
+        if stroke_count > 2:
             errors.append({
                 "type": "broken_stroke",
                 "description": "Character has disconnected parts",
@@ -919,44 +1639,49 @@ class TesseractOCRProcessor:
         
         return errors
     
-    def _generate_visual_overlay(self, image_path: str, character_analysis: Dict) -> str:
-        """Generate visual overlay with character highlights and annotations"""
+    def _read_overlay_base(self, image_path: str, size: Optional[tuple]):
+        """Read the image to draw on, scaled to the analysis size so boxes line up."""
         try:
-            import cv2
-            import numpy as np
-            
-            img = cv2.imread(image_path)
+            mtime_ns = os.stat(image_path).st_mtime_ns
+        except OSError:
+            return None
+        return _load_overlay_base(image_path, mtime_ns, tuple(size) if size else None)
+
+    def _character_colors(self, table: _CharacterTable) -> List[List[int]]:
+        """BGR overlay color per character, banded by top-match confidence in one vectorized pass"""
+        # right=True: a confidence of exactly 0.4 / 0.7 stays in the lower band
+        band = np.digitize(table.confs, _OVERLAY_CONF_BANDS, right=True)
+        return _OVERLAY_PALETTE[np.where(table.has_errors, len(_OVERLAY_PALETTE) - 1, band)].tolist()
+    
+    def _generate_visual_overlay(self, image_path: str, character_analysis: Optional[Dict], size: Optional[tuple] = None,
+                                 table: Optional[_CharacterTable] = None) -> str:
+        """Generate visual overlay with character highlights and annotations.
+        ``size`` is the (width, height) the boxes were computed at, if the image was analyzed downscaled.
+        Pass ``table`` to draw from an existing _CharacterTable instead of ``character_analysis``.
+        """
+        try:
+            img = self._read_overlay_base(image_path, size)
             if img is None:
                 return ""
             
             overlay = img.copy()
             
-            for char in character_analysis.get("characters", []):
-                x, y, w, h = char["bbox"]
-                
-                # Color coding based on analysis
-                matches = char.get("template_matches", [])
-                errors = char.get("errors", [])
-                
-                if errors:
-                    color = (0, 0, 255)  # Red for errors
-                elif matches and matches[0]["confidence"] > 0.7:
-                    color = (0, 255, 0)  # Green for high confidence
-                elif matches and matches[0]["confidence"] > 0.4:
-                    color = (0, 255, 255)  # Yellow for medium confidence
-                else:
-                    color = (255, 0, 0)  # Blue for low confidence
-                
+            if table is None:
+                table = _CharacterTable.from_characters(character_analysis.get("characters", []))
+            # Red for errors, else green / yellow / blue for high / medium / low confidence
+            colors = self._character_colors(table)
+            rows = zip(table.bboxes.tolist(), colors, table.letters, table.confs.tolist(), table.has_errors.tolist())
+            for (x, y, w, h), color, letter, conf, has_errors in rows:
                 # Draw bounding box
                 cv2.rectangle(overlay, (x, y), (x+w, y+h), color, 2)
                 
                 # Add character label
-                if matches:
-                    label = f"{matches[0]['letter']} ({matches[0]['confidence']:.2f})"
+                if letter:
+                    label = f"{letter} ({conf:.2f})"
                     cv2.putText(overlay, label, (x, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
                 
                 # Mark error zones
-                if errors:
+                if has_errors:
                     cv2.circle(overlay, (x+w//2, y+h//2), 3, (255, 0, 255), -1)
             
             # Save overlay
@@ -967,44 +1692,38 @@ class TesseractOCRProcessor:
         except Exception as e:
             return f"Error: {str(e)}"
 
-    def _generate_visual_overlay_with_words(self, image_path: str, character_analysis: Dict, tokens: List[Dict[str, Any]], word_feedback: List[Dict[str, Any]]) -> str:
+    def _generate_visual_overlay_with_words(self, image_path: str, character_analysis: Dict, tokens: List[Dict[str, Any]], word_feedback: List[Dict[str, Any]], size: Optional[tuple] = None,
+                                            table: Optional[_CharacterTable] = None) -> str:
         """Generate overlay that includes word boxes and indices in addition to character annotations."""
         try:
-            import cv2
-            img = cv2.imread(image_path)
+            img = self._read_overlay_base(image_path, size)
             if img is None:
                 return ""
             overlay = img.copy()
             
+            # Token boxes are looked up by index below; extract them once
+            token_boxes = np.array([t.get('bbox', [0,0,0,0]) for t in tokens], dtype=np.int32).reshape(-1, 4).tolist()
+            
             # Draw word boxes
-            for i, t in enumerate(tokens):
-                x, y, w, h = t.get('bbox', [0,0,0,0])
+            for i, (x, y, w, h) in enumerate(token_boxes):
                 cv2.rectangle(overlay, (x, y), (x+w, y+h), (255, 255, 0), 2)  # Cyan
                 cv2.putText(overlay, f"W{i}", (x, y-4), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
             
             # Draw characters as in basic overlay
-            for char in character_analysis.get("characters", []):
-                x, y, w, h = char["bbox"]
-                matches = char.get("template_matches", [])
-                errors = char.get("errors", [])
-                if errors:
-                    color = (0, 0, 255)
-                elif matches and matches[0].get("confidence", 0) > 0.7:
-                    color = (0, 255, 0)
-                elif matches and matches[0].get("confidence", 0) > 0.4:
-                    color = (0, 255, 255)
-                else:
-                    color = (255, 0, 0)
+            if table is None:
+                table = _CharacterTable.from_characters(character_analysis.get("characters", []))
+            rows = zip(table.bboxes.tolist(), self._character_colors(table), table.has_errors.tolist())
+            for (x, y, w, h), color, has_errors in rows:
                 cv2.rectangle(overlay, (x, y), (x+w, y+h), color, 1)
-                if errors:
+                if has_errors:
                     cv2.circle(overlay, (x+w//2, y+h//2), 3, (255, 0, 255), -1)
             
             # Annotate issues near words
             for wf in (word_feedback or []):
                 wi = wf.get('word_index')
-                if wi is None or wi < 0 or wi >= len(tokens):
+                if wi is None or wi < 0 or wi >= len(token_boxes):
                     continue
-                x, y, w, h = tokens[wi].get('bbox', [0,0,0,0])
+                x, y, w, h = token_boxes[wi]
                 label = f"{wf.get('word','')}"
                 cv2.putText(overlay, label, (x, y+h+14), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 200, 255), 1)
                 # Show first issue succinctly
@@ -1021,39 +1740,29 @@ class TesseractOCRProcessor:
             return ""
     
     def _create_a_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.ellipse(template, (16, 20), (8, 8), 0, 0, 360, 255, 2)
         cv2.line(template, (24, 12), (24, 28), 255, 2)
         return template
     
     def _create_c_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.ellipse(template, (16, 16), (8, 8), 0, 45, 315, 255, 2)
         return template
     
     def _create_e_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.ellipse(template, (16, 16), (8, 8), 0, 0, 360, 255, 2)
         cv2.line(template, (16, 16), (24, 16), 255, 2)
         return template
     
     def _create_g_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.ellipse(template, (16, 16), (8, 8), 0, 0, 360, 255, 2)
         cv2.line(template, (24, 16), (24, 30), 255, 2)
         return template
     
     def _create_h_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (8, 4), (8, 28), 255, 2)
         cv2.line(template, (24, 12), (24, 28), 255, 2)
@@ -1061,23 +1770,17 @@ class TesseractOCRProcessor:
         return template
     
     def _create_i_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (16, 12), (16, 28), 255, 2)
         cv2.circle(template, (16, 8), 2, 255, -1)
         return template
     
     def _create_l_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (16, 4), (16, 28), 255, 2)
         return template
     
     def _create_m_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (8, 12), (8, 28), 255, 2)
         cv2.line(template, (16, 12), (16, 28), 255, 2)
@@ -1087,8 +1790,6 @@ class TesseractOCRProcessor:
         return template
     
     def _create_n_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (8, 12), (8, 28), 255, 2)
         cv2.line(template, (24, 12), (24, 28), 255, 2)
@@ -1096,39 +1797,29 @@ class TesseractOCRProcessor:
         return template
     
     def _create_o_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.ellipse(template, (16, 16), (8, 8), 0, 0, 360, 255, 2)
         return template
     
     def _create_r_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (8, 12), (8, 28), 255, 2)
         cv2.ellipse(template, (16, 16), (8, 4), 0, 270, 90, 255, 2)
         return template
     
     def _create_s_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.ellipse(template, (16, 14), (6, 4), 0, 180, 360, 255, 2)
         cv2.ellipse(template, (16, 22), (6, 4), 0, 0, 180, 255, 2)
         return template
     
     def _create_t_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (16, 8), (16, 28), 255, 2)
         cv2.line(template, (8, 12), (24, 12), 255, 2)
         return template
     
     def _create_u_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (8, 12), (8, 24), 255, 2)
         cv2.line(template, (24, 12), (24, 28), 255, 2)
@@ -1136,8 +1827,6 @@ class TesseractOCRProcessor:
         return template
     
     def _create_w_template(self):
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (6, 12), (10, 28), 255, 2)
         cv2.line(template, (10, 28), (16, 20), 255, 2)
@@ -1147,8 +1836,6 @@ class TesseractOCRProcessor:
     
     def _create_b_template(self):
         """Create 'b' template with upper loop"""
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (8, 4), (8, 28), 255, 2)  # Vertical line
         cv2.ellipse(template, (16, 12), (8, 6), 0, 0, 180, 255, 2)  # Upper curve
@@ -1156,8 +1843,6 @@ class TesseractOCRProcessor:
     
     def _create_d_template(self):
         """Create 'd' template with right loop"""
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (24, 4), (24, 28), 255, 2)  # Vertical line
         cv2.ellipse(template, (16, 16), (8, 8), 0, 90, 270, 255, 2)  # Left curve
@@ -1165,24 +1850,21 @@ class TesseractOCRProcessor:
     
     def _create_p_template(self):
         """Create 'p' template with descender"""
-        import cv2
-        import numpy as np
         template = np.zeros((32, 32), dtype=np.uint8)
         cv2.line(template, (8, 12), (8, 30), 255, 2)  # Vertical line with descender
         cv2.ellipse(template, (16, 16), (8, 4), 0, 270, 90, 255, 2)  # Upper curve
         return template
 
-    def _analyze_image_quality(self, image: Image.Image) -> Dict[str, Any]:
+    def _analyze_image_quality(self, image: Image.Image, gray=None) -> Dict[str, Any]:
         """Analyze image quality"""
-        import numpy as np
-        
-        img_array = np.array(image.convert('L'))
+        img_array = gray if gray is not None else np.array(image.convert('L'))
+        stats = self._gray_stats(img_array)
         
         analysis = {
-            "brightness": np.mean(img_array),
-            "contrast": np.std(img_array),
+            "brightness": stats[0],
+            "contrast": stats[1],
             "sharpness": self._calculate_sharpness(img_array),
-            "text_density": self._estimate_text_density(img_array),
+            "text_density": self._estimate_text_density(img_array, stats),
             "image_size": image.size,
             "issues": [],
             "suggestions": []
@@ -1216,49 +1898,60 @@ class TesseractOCRProcessor:
     
     def _calculate_sharpness(self, img_array) -> float:
         """Simple sharpness calculation"""
-        import numpy as np
-        edges = np.abs(np.diff(img_array, axis=0)).sum() + np.abs(np.diff(img_array, axis=1)).sum()
+        # uint8 differences wrap modulo 256 (the "blurry" threshold is tuned to that), so
+        # both axes can be written into one reused uint8 buffer and summed directly
+        buf = np.empty(img_array.size, dtype=np.uint8)
+        edges = 0
+        for a, b in ((img_array[1:], img_array[:-1]), (img_array[:, 1:], img_array[:, :-1])):
+            diff = np.subtract(a, b, out=buf[:a.size].reshape(a.shape))
+            edges += int(diff.sum(dtype=np.uint64))
         return edges / img_array.size
     
-    def _estimate_text_density(self, img_array) -> float:
+    def _gray_stats(self, img_array) -> tuple:
+        """Mean, population std and 256-bin histogram of a uint8 image from a single pass"""
+        if cv2 is not None:
+            hist = cv2.calcHist([img_array], [0], None, [256], [0, 256]).ravel().astype(np.float64)
+        else:
+            hist = np.bincount(img_array.ravel(), minlength=256).astype(np.float64)
+        levels = np.arange(256, dtype=np.float64)
+        total = hist.sum()
+        mean = float(hist @ levels / total)
+        std = float(np.sqrt(hist @ (levels - mean) ** 2 / total))
+        return mean, std, hist
+    
+    def _estimate_text_density(self, img_array, stats: Optional[tuple] = None) -> float:
         """Estimate text density"""
-        import numpy as np
-        threshold = np.mean(img_array) - np.std(img_array)
-        text_pixels = np.sum(img_array < threshold)
-        return text_pixels / img_array.size
+        mean, std, hist = stats if stats is not None else self._gray_stats(img_array)
+        threshold = mean - std
+        # Pixels below a float threshold are the histogram bins below ceil(threshold)
+        text_pixels = hist[:min(256, max(0, math.ceil(threshold)))].sum()
+        return float(text_pixels / img_array.size)
     
     def _post_process_text(self, text: str) -> str:
         """Post-process OCR text keeping line structure and fixing common errors."""
         if not text:
             return text
-        import re
         # Normalize Windows/Mac line endings, collapse excessive spaces but preserve newlines
         text = text.replace('\r\n', '\n').replace('\r', '\n')
-        lines = [re.sub(r'\s+', ' ', ln).strip() for ln in text.split('\n')]
+        lines = [ln.strip() for ln in _INLINE_WS_RE.sub(' ', text).split('\n')]
         text = '\n'.join([ln for ln in lines if ln])
         
-        corrections = {'rn': 'm', 'cl': 'd', 'vv': 'w', 'ii': 'n'}
-        for wrong, correct in corrections.items():
-            text = text.replace(wrong, correct)
+        text = _OCR_FIX_RE.sub(lambda m: _OCR_FIXES[m.group(0)], text)
         
         # Isolated digit confusions
-        text = re.sub(r'\b1\b', 'I', text)
-        text = re.sub(r'\b0\b', 'O', text)
+        text = _ISOLATED_ONE_RE.sub('I', text)
+        text = _ISOLATED_ZERO_RE.sub('O', text)
         # Collapse extreme repeats
-        text = re.sub(r'(.)\1{3,}', r'\1', text)
+        text = _REPEAT_RE.sub(r'\1', text)
         return text
     
     def _analyze_basic_errors(self, text: str) -> List[Dict[str, Any]]:
         """Basic error detection"""
         errors = []
+        found = set(_OCR_CONFUSION_RE.findall(text))
         
-        common_ocr_errors = {
-            '0': 'O', '1': 'I', '5': 'S', '8': 'B',
-            'cl': 'd', 'rn': 'm', 'vv': 'w', 'ii': 'n'
-        }
-        
-        for wrong, correct in common_ocr_errors.items():
-            if wrong in text:
+        for wrong, correct in _OCR_CONFUSIONS.items():
+            if wrong in found:
                 errors.append({
                     "type": "ocr_confusion",
                     "detected": wrong,
@@ -1274,7 +1967,10 @@ class TesseractOCRProcessor:
             return 0.0
         
         confidence = 0.4
-        readable_chars = sum(1 for c in text if c.isalnum() or c.isspace())
+        if text.isascii() and _READABLE_ASCII is not None:
+            readable_chars = int(np.count_nonzero(_READABLE_ASCII[np.frombuffer(text.encode('ascii'), dtype=np.uint8)]))
+        else:
+            readable_chars = sum(1 for c in text if c.isalnum() or c.isspace())
         total_chars = len(text)
         
         if total_chars > 0:
@@ -1292,6 +1988,41 @@ class TesseractOCRProcessor:
         
         return min(1.0, confidence)
 
+# Per-process processor for recognize_handwriting_batch workers
+_batch_processor: Optional[TesseractOCRProcessor] = None
+
+# Batch worker pools, keyed by worker count. Each is created on first use and kept for the life
+# of the process, so workers import cv2/numpy and build their processor once, not once per batch.
+_BATCH_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_BATCH_POOL_LOCK = threading.Lock()
+
+
+def _init_batch_worker() -> None:
+    """Process-pool initializer: one processor (and one set of loaded models) per worker."""
+    global _batch_processor
+    # Tesseract's own OpenMP threads would compete with the sibling worker processes
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+    _batch_processor = TesseractOCRProcessor()
+
+
+def _batch_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Shared worker processes for batch recognition. They are spawned, not forked: a forked child
+    would inherit _OCR_EXECUTOR without its threads, so OCR work submitted there never ran, along
+    with the parent's tesserocr handles."""
+    with _BATCH_POOL_LOCK:
+        pool = _BATCH_POOLS.get(max_workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_batch_worker
+            )
+            _BATCH_POOLS[max_workers] = pool
+        return pool
+
+
+def _recognize_in_worker(image_path: str, language: str) -> Dict[str, Any]:
+    return asyncio.run(_batch_processor.recognize_handwriting(image_path, language))
+
+
 class HandwritingAnalyzer:
     """Minimal handwriting analysis"""
     
@@ -1301,6 +2032,25 @@ class HandwritingAnalyzer:
     async def recognize_handwriting(self, image_path: str, language: str = "en") -> Dict[str, Any]:
         return await self.processor.recognize_handwriting(image_path, language)
     
+    async def recognize_handwriting_batch(self, image_paths: List[str], language: str = "en",
+                                          max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recognize many pages in parallel worker processes; results keep the input order."""
+        if not image_paths:
+            return []
+        workers = max_workers or os.cpu_count() or 1
+        pool = _batch_pool(workers)
+        loop = asyncio.get_running_loop()
+        # The loop never waits on the pool itself; if this task is cancelled, its queued pages are dropped
+        futures = [loop.run_in_executor(pool, _recognize_in_worker, path, language) for path in image_paths]
+        try:
+            return list(await asyncio.gather(*futures))
+        except BrokenProcessPool:
+            # A worker died and took the pool with it; the next batch starts a fresh one
+            with _BATCH_POOL_LOCK:
+                if _BATCH_POOLS.get(workers) is pool:
+                    del _BATCH_POOLS[workers]
+            raise
+    
     async def correct_handwriting(self, image_path: str, language: str = "en") -> Dict[str, Any]:
         result = await self.recognize_handwriting(image_path, language)
         
@@ -3,35 +3,162 @@ Comprehensive lesson content for dyslexic students
 Structured learning materials with multi-sensory approaches
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+import sys
 import json
+import functools
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Rubric bands from best to worst; a score below every threshold falls into the last one
+_GRADE_LABELS = ("excellent", "good", "needs_improvement", "below")
+
+
+def _dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON, the same bytes FastAPI's JSONResponse would send"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _intern_tree(obj: Any) -> Any:
+    """Intern the short, heavily repeated strings (keys, categories, levels) in a catalog tree"""
+    if isinstance(obj, str):
+        return sys.intern(obj) if len(obj) < 32 else obj
+    if isinstance(obj, dict):
+        return {_intern_tree(key): _intern_tree(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_intern_tree(item) for item in obj]
+    return obj
+
+
+class _FrozenDict(dict):
+    """Read-only dict for shared catalog content; still a dict to json, orjson and FastAPI"""
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("lesson content is read-only; copy it with dict() before modifying")
+    
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __reduce__(self):
+        # copy/deepcopy/pickle produce a plain, mutable dict
+        return (dict, (dict(self),))
+
+
+def _freeze(obj: Any) -> Any:
+    """Make a catalog tree immutable so it can be shared across requests without copying"""
+    if isinstance(obj, dict):
+        return _FrozenDict((key, _freeze(value)) for key, value in obj.items())
+    if isinstance(obj, list):
+        return tuple(_freeze(item) for item in obj)
+    return obj
+
+
+class LessonMeta(NamedTuple):
+    """The small, frequently listed fields of a lesson"""
+    id: int
+    title: str
+    category: str
+    difficulty: str
+    duration: int
+    description: str
+
+
+class Lesson(NamedTuple):
+    """A single structured lesson"""
+    id: int
+    title: str
+    category: str
+    difficulty: str
+    duration: int
+    description: str
+    learning_objectives: Tuple[str, ...]
+    content: Dict[str, Any]
+    multisensory_elements: Optional[Dict[str, Any]] = None
+    assessment_criteria: Optional[Dict[str, Any]] = None
+    
+    @property
+    def meta(self) -> LessonMeta:
+        """Summary fields of this lesson"""
+        return LessonMeta._make(self[:len(LessonMeta._fields)])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Dict form served by the API, without the sections this lesson doesn't have"""
+        return _FrozenDict((field, value) for field, value in zip(self._fields, self) if value is not None)
+
+
 class LessonContentManager:
     """Manages structured lesson content for dyslexic learners"""
     
+    __slots__ = (
+        "lessons", "exercises", "assessments", "_by_category", "_meta",
+        "_summary_json", "_lessons_json", "_by_category_json", "_thresholds", "_sight_word_sets",
+    )
+    
     def __init__(self):
+        # The catalog literals are built once per process and shared by every instance
         self.lessons = self._initialize_lessons()
         self.exercises = self._initialize_exercises()
         self.assessments = self._initialize_assessments()
+        
+        # Index lessons by category, and keep the summary fields apart from the content bodies
+        # so listing lessons never touches the larger nested content
+        self._by_category: Dict[str, List[Lesson]] = {}
+        for lesson in self.lessons.values():
+            self._by_category.setdefault(lesson.category, []).append(lesson)
+        self._meta: Dict[int, LessonMeta] = {lesson_id: lesson.meta for lesson_id, lesson in self.lessons.items()}
+        
+        # The catalog is static, so serialize it once instead of on every request
+        self._summary_json = _dumps([meta._asdict() for meta in self._meta.values()])
+        self._lessons_json = {lesson_id: _dumps(lesson.to_dict()) for lesson_id, lesson in self.lessons.items()}
+        self._by_category_json = {
+            category: _dumps([lesson.to_dict() for lesson in lessons])
+            for category, lessons in self._by_category.items()
+        }
+        
+        # Numeric rubric thresholds per (category, skill), ordered excellent -> needs_improvement
+        self._thresholds: Dict[str, Dict[str, Any]] = {}
+        for category, assessment in self.assessments.items():
+            for skill, bands in assessment.get("criteria", {}).items():
+                values = [bands.get(label) for label in _GRADE_LABELS[:-1]]
+                if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                    thresholds = np.array(values, dtype=np.float64) if np is not None else values
+                    self._thresholds.setdefault(category, {})[skill] = thresholds
+        
+        # Sight-word lists by level as lowercase sets for constant-time lookups
+        self._sight_word_sets: Dict[str, frozenset] = {}
+        for lesson in self.lessons.values():
+            for level, words in lesson.content.get("word_lists", {}).items():
+                self._sight_word_sets[level] = frozenset(word.lower() for word in words)
     
-    def _initialize_lessons(self) -> Dict[int, Dict[str, Any]]:
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _initialize_lessons(cls) -> Dict[int, Lesson]:
         """Initialize comprehensive lesson content"""
-        return {
-            1: {
-                "id": 1,
-                "title": "Phonemic Awareness Fundamentals",
-                "category": "phonics",
-                "difficulty": "beginner",
-                "duration": 20,
-                "description": "Master the foundation of reading by understanding individual sounds in words",
-                "learning_objectives": [
+        lessons = {
+            1: Lesson(
+                id=1,
+                title="Phonemic Awareness Fundamentals",
+                category="phonics",
+                difficulty="beginner",
+                duration=20,
+                description="Master the foundation of reading by understanding individual sounds in words",
+                learning_objectives=[
                     "Identify individual phonemes in spoken words",
                     "Blend phonemes to form words",
                     "Segment words into individual sounds",
                     "Manipulate phonemes to create new words"
                 ],
-                "content": {
+                content={
                     "introduction": "Phonemic awareness is the ability to hear, identify, and manipulate individual sounds in spoken words. This is crucial for reading success.",
                     "key_concepts": [
                         {
@@ -67,33 +194,33 @@ class LessonContentManager:
                         }
                     ]
                 },
-                "multisensory_elements": {
+                multisensory_elements={
                     "visual": ["Color-coded phoneme charts", "Mouth position diagrams"],
                     "auditory": ["Clear pronunciation examples", "Rhythm and rhyme patterns"],
                     "kinesthetic": ["Hand gestures for each sound", "Physical movement activities"],
                     "tactile": ["Textured letter cards", "Sand tray writing"]
                 },
-                "assessment_criteria": {
+                assessment_criteria={
                     "phoneme_identification": "Can identify 80% of phonemes correctly",
                     "blending_accuracy": "Successfully blends 3-4 phoneme words",
                     "segmentation_skills": "Can break words into individual sounds"
                 }
-            },
+            ),
             
-            2: {
-                "id": 2,
-                "title": "Letter-Sound Correspondence",
-                "category": "phonics",
-                "difficulty": "beginner",
-                "duration": 25,
-                "description": "Connect letters with their corresponding sounds using systematic phonics instruction",
-                "learning_objectives": [
+            2: Lesson(
+                id=2,
+                title="Letter-Sound Correspondence",
+                category="phonics",
+                difficulty="beginner",
+                duration=25,
+                description="Connect letters with their corresponding sounds using systematic phonics instruction",
+                learning_objectives=[
                     "Master single letter-sound relationships",
                     "Recognize common letter patterns",
                     "Apply phonics rules in reading",
                     "Decode simple words using phonics knowledge"
                 ],
-                "content": {
+                content={
                     "introduction": "Understanding how letters represent sounds is essential for reading. We'll use systematic, explicit instruction to build this foundation.",
                     "key_concepts": [
                         {
@@ -131,28 +258,28 @@ class LessonContentManager:
                         }
                     ]
                 },
-                "multisensory_elements": {
+                multisensory_elements={
                     "visual": ["Large, clear letter cards", "Color coding for vowels/consonants"],
                     "auditory": ["Letter sound songs", "Alliterative phrases"],
                     "kinesthetic": ["Sky writing", "Letter formation in air"],
                     "tactile": ["Sandpaper letters", "Play dough letter formation"]
                 }
-            },
+            ),
             
-            3: {
-                "id": 3,
-                "title": "Sight Word Mastery",
-                "category": "vocabulary",
-                "difficulty": "beginner",
-                "duration": 15,
-                "description": "Learn high-frequency words that appear often in text but may not follow regular phonics patterns",
-                "learning_objectives": [
+            3: Lesson(
+                id=3,
+                title="Sight Word Mastery",
+                category="vocabulary",
+                difficulty="beginner",
+                duration=15,
+                description="Learn high-frequency words that appear often in text but may not follow regular phonics patterns",
+                learning_objectives=[
                     "Recognize 100 most common sight words instantly",
                     "Read sight words in context",
                     "Spell common sight words accurately",
                     "Use sight words in writing"
                 ],
-                "content": {
+                content={
                     "introduction": "Sight words are words that appear frequently in text. Learning to recognize them instantly improves reading fluency.",
                     "word_lists": {
                         "pre_primer": ["a", "and", "away", "big", "blue", "can", "come", "down", "find", "for", "funny", "go", "help", "here", "I", "in", "is", "it", "jump", "little", "look", "make", "me", "my", "not", "one", "play", "red", "run", "said", "see", "the", "three", "to", "two", "up", "we", "where", "yellow", "you"],
@@ -186,22 +313,22 @@ class LessonContentManager:
                         }
                     ]
                 }
-            },
+            ),
             
-            4: {
-                "id": 4,
-                "title": "Reading Fluency Development",
-                "category": "fluency",
-                "difficulty": "intermediate",
-                "duration": 30,
-                "description": "Build smooth, accurate, and expressive reading through systematic practice",
-                "learning_objectives": [
+            4: Lesson(
+                id=4,
+                title="Reading Fluency Development",
+                category="fluency",
+                difficulty="intermediate",
+                duration=30,
+                description="Build smooth, accurate, and expressive reading through systematic practice",
+                learning_objectives=[
                     "Read with appropriate speed and accuracy",
                     "Use proper expression and intonation",
                     "Recognize punctuation cues",
                     "Self-monitor reading for meaning"
                 ],
-                "content": {
+                content={
                     "introduction": "Reading fluency is the bridge between word recognition and comprehension. Fluent readers can focus on meaning rather than decoding.",
                     "components": {
                         "accuracy": {
@@ -240,22 +367,22 @@ class LessonContentManager:
                         }
                     ]
                 }
-            },
+            ),
             
-            5: {
-                "id": 5,
-                "title": "Reading Comprehension Strategies",
-                "category": "comprehension",
-                "difficulty": "intermediate",
-                "duration": 35,
-                "description": "Develop active reading strategies to understand and analyze text meaning",
-                "learning_objectives": [
+            5: Lesson(
+                id=5,
+                title="Reading Comprehension Strategies",
+                category="comprehension",
+                difficulty="intermediate",
+                duration=35,
+                description="Develop active reading strategies to understand and analyze text meaning",
+                learning_objectives=[
                     "Use before, during, and after reading strategies",
                     "Make connections between text and experience",
                     "Ask and answer questions about text",
                     "Summarize main ideas and details"
                 ],
-                "content": {
+                content={
                     "introduction": "Comprehension is the ultimate goal of reading. Active readers use strategies to construct meaning from text.",
                     "strategy_categories": {
                         "before_reading": [
@@ -301,22 +428,22 @@ class LessonContentManager:
                         ]
                     }
                 }
-            },
+            ),
             
-            6: {
-                "id": 6,
-                "title": "Spelling Patterns and Rules",
-                "category": "spelling",
-                "difficulty": "intermediate",
-                "duration": 25,
-                "description": "Master common spelling patterns and rules to improve writing accuracy",
-                "learning_objectives": [
+            6: Lesson(
+                id=6,
+                title="Spelling Patterns and Rules",
+                category="spelling",
+                difficulty="intermediate",
+                duration=25,
+                description="Master common spelling patterns and rules to improve writing accuracy",
+                learning_objectives=[
                     "Apply common spelling rules",
                     "Recognize spelling patterns",
                     "Use spelling strategies for unknown words",
                     "Proofread and self-correct spelling errors"
                 ],
-                "content": {
+                content={
                     "spelling_rules": [
                         {
                             "rule": "Silent E Rule",
@@ -348,22 +475,22 @@ class LessonContentManager:
                         }
                     ]
                 }
-            },
+            ),
             
-            7: {
-                "id": 7,
-                "title": "Writing Fundamentals",
-                "category": "writing",
-                "difficulty": "beginner",
-                "duration": 30,
-                "description": "Develop basic writing skills including letter formation, sentence structure, and organization",
-                "learning_objectives": [
+            7: Lesson(
+                id=7,
+                title="Writing Fundamentals",
+                category="writing",
+                difficulty="beginner",
+                duration=30,
+                description="Develop basic writing skills including letter formation, sentence structure, and organization",
+                learning_objectives=[
                     "Form letters correctly and legibly",
                     "Write complete sentences",
                     "Organize ideas in logical order",
                     "Use basic punctuation and capitalization"
                 ],
-                "content": {
+                content={
                     "letter_formation": {
                         "lowercase": {
                             "starting_letters": ["c", "o", "a", "d", "g", "q"],
@@ -384,22 +511,22 @@ class LessonContentManager:
                         ]
                     }
                 }
-            },
+            ),
             
-            8: {
-                "id": 8,
-                "title": "Memory and Organization Strategies",
-                "category": "study_skills",
-                "difficulty": "intermediate",
-                "duration": 20,
-                "description": "Learn techniques to improve memory, organization, and study effectiveness",
-                "learning_objectives": [
+            8: Lesson(
+                id=8,
+                title="Memory and Organization Strategies",
+                category="study_skills",
+                difficulty="intermediate",
+                duration=20,
+                description="Learn techniques to improve memory, organization, and study effectiveness",
+                learning_objectives=[
                     "Use memory strategies for learning",
                     "Organize materials and workspace",
                     "Manage time effectively",
                     "Apply study techniques for different subjects"
                 ],
-                "content": {
+                content={
                     "memory_strategies": [
                         {
                             "strategy": "Mnemonics",
@@ -424,12 +551,16 @@ class LessonContentManager:
                         "Digital calendars"
                     ]
                 }
-            }
+            )
         }
+        # Freeze and intern each lesson's fields the same way as the other catalog trees
+        return {lesson_id: Lesson._make(_freeze(_intern_tree(list(lesson)))) for lesson_id, lesson in lessons.items()}
     
-    def _initialize_exercises(self) -> Dict[str, List[Dict[str, Any]]]:
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _initialize_exercises(cls) -> Dict[str, List[Dict[str, Any]]]:
         """Initialize practice exercises for each lesson"""
-        return {
+        return _freeze(_intern_tree({
             "phonemic_awareness": [
                 {
                     "type": "sound_identification",
@@ -466,11 +597,13 @@ class LessonContentManager:
                     ]
                 }
             ]
-        }
+        }))
     
-    def _initialize_assessments(self) -> Dict[str, Dict[str, Any]]:
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _initialize_assessments(cls) -> Dict[str, Dict[str, Any]]:
         """Initialize assessment rubrics and criteria"""
-        return {
+        return _freeze(_intern_tree({
             "phonemic_awareness": {
                 "criteria": {
                     "sound_identification": {"excellent": 90, "good": 80, "needs_improvement": 70},
@@ -490,15 +623,35 @@ class LessonContentManager:
                     "prosody": {"excellent": 4, "good": 3, "needs_improvement": 2}
                 }
             }
-        }
+        }))
     
     def get_lesson(self, lesson_id: int) -> Dict[str, Any]:
         """Get complete lesson content by ID"""
-        return self.lessons.get(lesson_id, {})
+        lesson = self.lessons.get(lesson_id)
+        return lesson.to_dict() if lesson is not None else {}
+    
+    def get_lesson_meta(self, lesson_id: int) -> Optional[LessonMeta]:
+        """Get just the summary fields of a lesson (None if not found)"""
+        return self._meta.get(lesson_id)
+    
+    def get_lesson_json(self, lesson_id: int) -> Optional[bytes]:
+        """Get complete lesson content by ID as pre-serialized JSON (None if not found)"""
+        return self._lessons_json.get(lesson_id)
     
     def get_lessons_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Get all lessons in a specific category"""
-        return [lesson for lesson in self.lessons.values() if lesson.get("category") == category]
+        return [lesson.to_dict() for lesson in self._by_category.get(category, ())]
+    
+    def get_lessons_by_category_json(self, category: str) -> bytes:
+        """Get all lessons in a specific category as pre-serialized JSON"""
+        return self._by_category_json.get(category, b"[]")
+    
+    def is_sight_word(self, word: str, level: Optional[str] = None) -> bool:
+        """Check whether a word is a sight word, at a given level or at any level"""
+        word = word.strip().lower()
+        if level is not None:
+            return word in self._sight_word_sets.get(level, ())
+        return any(word in words for words in self._sight_word_sets.values())
     
     def get_exercises(self, lesson_category: str) -> List[Dict[str, Any]]:
         """Get exercises for a lesson category"""
@@ -508,19 +661,34 @@ class LessonContentManager:
         """Get assessment criteria for a lesson category"""
         return self.assessments.get(lesson_category, {})
     
-    def get_all_lessons_summary(self) -> List[Dict[str, Any]]:
-        """Get summary of all available lessons"""
+    def grade_batch(self, category: str, skill: str, scores) -> List[str]:
+        """Map a batch of scores to rubric labels for one assessed skill"""
+        thresholds = self._thresholds[category][skill]
+        if np is not None:
+            # Thresholds descend, so search the negated values; side="left" puts a score equal to a threshold in that band
+            bands = np.searchsorted(-thresholds, -np.asarray(scores, dtype=np.float64), side="left")
+            return [_GRADE_LABELS[band] for band in bands.tolist()]
         return [
-            {
-                "id": lesson["id"],
-                "title": lesson["title"],
-                "category": lesson["category"],
-                "difficulty": lesson["difficulty"],
-                "duration": lesson["duration"],
-                "description": lesson["description"]
-            }
-            for lesson in self.lessons.values()
+            next((label for label, threshold in zip(_GRADE_LABELS, thresholds) if score >= threshold), _GRADE_LABELS[-1])
+            for score in scores
         ]
+    
+    def get_all_lessons_summary(self) -> List[Dict[str, Any]]:
+        """Get summary of all available lessons"""
+        # Fresh dicts, since callers annotate entries per request
+        return [meta._asdict() for meta in self._meta.values()]
+    
+    def get_all_lessons_summary_json(self) -> bytes:
+        """Get summary of all available lessons as pre-serialized JSON"""
+        return self._summary_json
+
+@functools.lru_cache(maxsize=1)
+def get_lesson_manager() -> LessonContentManager:
+    """Get the shared lesson content manager, building it on first use"""
+    return LessonContentManager()
 
-# Initialize the lesson content manager
-lesson_manager = LessonContentManager()
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    # Keep `from .lesson_content import lesson_manager` working without building the catalog at import time
+    if name == "lesson_manager":
+        return get_lesson_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,180 @@
 import tempfile
 import os
-import requests
 import json
+import asyncio
+import functools
+import hashlib
+import importlib.util
+import threading
+import io
+import mmap
+import re
+import shutil
+import wave
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from config import settings
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from rapidfuzz.distance import Levenshtein
+except ImportError:
+    Levenshtein = None
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+# Whisper backends pull in torch/CTranslate2 and take seconds to import, so only check
+# they are installed here; the import itself happens once, when the model first loads
+_HAS_FASTER_WHISPER = importlib.util.find_spec("faster_whisper") is not None
+_HAS_WHISPER = importlib.util.find_spec("whisper") is not None
+
+# Recent API results kept in memory so replayed clips and repeated phrases skip the round trip
+_STT_CACHE_SIZE = 64
+_TTS_CACHE_SIZE = 32
+
+# Upper bound on concurrent calls to the inference API from one processor
+_HF_MAX_IN_FLIGHT = 32
+
+# Transient API failures (rate limiting, model still loading) are retried with backoff
+_HF_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_HF_MAX_ATTEMPTS = 3
+_HF_BACKOFF_SECONDS = 0.5
+
+# Below this size a plain read is cheaper than setting up a memory map
+_MMAP_MIN_BYTES = 64 * 1024
+
+# WAV uploads at least this large are re-encoded as Opus before going to the inference API
+_TRANSCODE_MIN_BYTES = 64 * 1024
+
+# Chunk size for streaming synthesized audio to disk
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+# Bounded pool for local Whisper decodes; torch releases the GIL, and capping the
+# workers keeps concurrent clips from oversubscribing the CPU
+_WHISPER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("WHISPER_WORKERS", "2")), thread_name_prefix="whisper"
+)
+
+_WHISPER_SAMPLE_RATE = 16000
+
+# Word alignments at least this long build the edit table with NumPy rows
+_VECTORIZE_MIN_WORDS = 32
+
+# Speech pattern checks
+_REPETITION_RE = re.compile(r'\b(\w+)\s+\1\b')
+_FILLERS = frozenset({"um", "uh", "like"})
+_BIGRAM_FILLERS = frozenset({("you", "know")})
+
+def _decode_audio_bytes(audio_bytes: bytes):
+    """Decode an uploaded clip to Whisper's 16 kHz mono float32 input without touching disk"""
+    # 16-bit PCM WAV already at 16 kHz decodes directly
+    try:
+        with wave.open(io.BytesIO(audio_bytes)) as wav:
+            if wav.getsampwidth() == 2 and wav.getframerate() == _WHISPER_SAMPLE_RATE:
+                samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+                samples = samples.reshape(-1, wav.getnchannels()).mean(axis=1)
+                return (samples / 32768.0).astype(np.float32)
+    except (wave.Error, EOFError):
+        pass
+    # Anything else goes through ffmpeg over a pipe, the same conversion whisper.load_audio runs on a file
+    cmd = [
+        "ffmpeg", "-threads", "0", "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(_WHISPER_SAMPLE_RATE), "-"
+    ]
+    out = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True).stdout
+    return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+def _encode_for_upload(audio_data: bytes) -> Tuple[Any, Optional[str]]:
+    """Shrink a WAV clip to Ogg/Opus for upload, returning (payload, content_type).
+    Anything else, or a clip that can't be re-encoded, is sent unchanged with no content type."""
+    if sf is None or len(audio_data) < _TRANSCODE_MIN_BYTES or bytes(audio_data[8:12]) != b"WAVE":
+        return audio_data, None
+    try:
+        samples, sample_rate = sf.read(io.BytesIO(audio_data), dtype="int16")
+        encoded = io.BytesIO()
+        sf.write(encoded, samples, sample_rate, format="OGG", subtype="OPUS")
+        return encoded.getvalue(), "audio/ogg"
+    except Exception:
+        return audio_data, None
+
+def _edit_distance_table(source: List[str], target: List[str]) -> List[List[int]]:
+    """Wagner-Fischer table for long passages, one NumPy pass per row instead of per cell"""
+    word_ids: Dict[str, int] = {}
+    source_ids = np.array([word_ids.setdefault(word, len(word_ids)) for word in source])
+    target_ids = np.array([word_ids.setdefault(word, len(word_ids)) for word in target])
+    n, m = len(source), len(target)
+    cols = np.arange(m + 1)
+    table = np.empty((n + 1, m + 1), dtype=np.int64)
+    table[0] = cols
+    for i in range(1, n + 1):
+        prev = table[i - 1]
+        row = np.empty(m + 1, dtype=np.int64)
+        row[0] = i
+        # Deletions and substitutions only look at the previous row
+        np.minimum(prev[1:] + 1, prev[:-1] + (target_ids != source_ids[i - 1]), out=row[1:])
+        # Insertions chain along the row: row[j] = min over k <= j of row[k] + (j - k)
+        table[i] = np.minimum.accumulate(row - cols) + cols
+    return table.tolist()
+
+def _word_editops(source: List[str], target: List[str]) -> List[Tuple[str, int, int]]:
+    """Minimal word-level edit script turning source into target, as (op, source_pos, target_pos)"""
+    if Levenshtein is not None:
+        return [(op.tag, op.src_pos, op.dest_pos) for op in Levenshtein.editops(source, target)]
+    
+    # Wagner-Fischer table with a backtrace, when rapidfuzz isn't installed
+    n, m = len(source), len(target)
+    if np is not None and min(n, m) >= _VECTORIZE_MIN_WORDS:
+        dist = _edit_distance_table(source, target)
+    else:
+        dist = [[0] * (m + 1) for _ in range(n + 1)]
+        for i in range(n + 1):
+            dist[i][0] = i
+        for j in range(m + 1):
+            dist[0][j] = j
+        for i in range(1, n + 1):
+            row, prev = dist[i], dist[i - 1]
+            for j in range(1, m + 1):
+                cost = 0 if source[i - 1] == target[j - 1] else 1
+                row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+    
+    ops = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and dist[i][j] == dist[i - 1][j - 1] + (source[i - 1] != target[j - 1]):
+            if source[i - 1] != target[j - 1]:
+                ops.append(("replace", i - 1, j - 1))
+            i, j = i - 1, j - 1
+        elif i > 0 and dist[i][j] == dist[i - 1][j] + 1:
+            ops.append(("delete", i - 1, j))
+            i -= 1
+        else:
+            ops.append(("insert", i, j - 1))
+            j -= 1
+    ops.reverse()
+    return ops
+
+async def _coalesced(inflight: Dict[Any, "asyncio.Task"], key, make_request):
+    """Share one in-flight request among concurrent callers asking for the same thing"""
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(make_request())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # A caller that gives up must not cancel the request the others are waiting on
+    return await asyncio.shield(task)
+
 class SpeechProcessorInterface(ABC):
     """Interface for speech processing providers"""
     
@@ -16,6 +185,16 @@ class SpeechProcessorInterface(ABC):
     @abstractmethod
     async def text_to_speech(self, text: str, voice: str = "alloy", language: str = "en") -> Dict[str, Any]:
         pass
+    
+    async def speech_to_text_bytes(self, audio_bytes: bytes, language: str = "en") -> Dict[str, Any]:
+        """Transcribe in-memory audio; providers that need a file path get a temporary one"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
+            temp_file.write(audio_bytes)
+            temp_file_path = temp_file.name
+        try:
+            return await self.speech_to_text(temp_file_path, language)
+        finally:
+            os.remove(temp_file_path)
 
 class WebSpeechAPIProcessor(SpeechProcessorInterface):
     """Lightweight processor that delegates to browser's Web Speech API"""
@@ -74,14 +253,65 @@ class WebSpeechAPIProcessor(SpeechProcessorInterface):
 class LocalWhisperProcessor(SpeechProcessorInterface):
     """Local Whisper processing (heavier but more private)"""
     
+    # One model per process, loaded on first transcription rather than at construction
+    _model = None
+    _model_lock = threading.Lock()
+    _faster_whisper = False
+    
     def __init__(self):
-        self.whisper_available = False
-        try:
-            import whisper
-            self.model = whisper.load_model("tiny")  # Use smallest model for speed
-            self.whisper_available = True
-        except ImportError:
-            print("Whisper not available - install with: pip install openai-whisper")
+        self._inflight: Dict[str, "asyncio.Task"] = {}
+        self.whisper_available = _HAS_FASTER_WHISPER or _HAS_WHISPER
+        if not self.whisper_available:
+            print("Whisper not available - install with: pip install faster-whisper (or openai-whisper)")
+    
+    @classmethod
+    def _get_model(cls):
+        """Load the shared Whisper model once"""
+        with cls._model_lock:
+            if cls._model is None:
+                # Default to the smallest model for speed
+                model_name = os.getenv("WHISPER_MODEL", "tiny")
+                if _HAS_FASTER_WHISPER:
+                    # CTranslate2 port of the same weights, quantized to int8: several times
+                    # faster and about half the memory of the PyTorch model on CPU
+                    from faster_whisper import WhisperModel
+                    import ctranslate2
+                    device = os.getenv("WHISPER_DEVICE") or ("cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu")
+                    model = WhisperModel(model_name, device=device, compute_type="int8_float16" if device == "cuda" else "int8")
+                    cls._faster_whisper = True
+                else:
+                    import whisper
+                    import torch
+                    device = os.getenv("WHISPER_DEVICE") or ("cuda" if torch.cuda.is_available() else "cpu")
+                    model = whisper.load_model(model_name, device=device)
+                    cls._faster_whisper = False
+                try:
+                    # One second of silence compiles kernels and fills caches before the first real clip
+                    cls._decode(model, np.zeros(_WHISPER_SAMPLE_RATE, dtype=np.float32), None)
+                except Exception as e:
+                    print(f"Whisper warmup failed: {e}")
+                cls._model = model
+            return cls._model
+    
+    @classmethod
+    def _decode(cls, model, audio, language: Optional[str]) -> Dict[str, Any]:
+        """Transcribe with whichever backend is loaded, in openai-whisper's result shape"""
+        if cls._faster_whisper:
+            # Greedy decoding, and the VAD filter skips silent stretches entirely
+            segments, info = model.transcribe(audio, language=language, beam_size=1, vad_filter=True)
+            segments = [{"start": seg.start, "end": seg.end, "text": seg.text} for seg in segments]
+            return {
+                "text": "".join(seg["text"] for seg in segments),
+                "language": info.language,
+                "segments": segments
+            }
+        # Half precision only helps (and only works) on GPU; asking for it on CPU just warns
+        fp16 = getattr(getattr(model, "device", None), "type", "cpu") == "cuda"
+        return model.transcribe(audio, language=language, fp16=fp16)
+    
+    @property
+    def model(self):
+        return self._get_model()
     
     async def speech_to_text(self, audio_file_path: str, language: str = "en") -> Dict[str, Any]:
         """Convert speech to text using local Whisper"""
@@ -101,7 +331,9 @@ class LocalWhisperProcessor(SpeechProcessorInterface):
             }
         
         try:
-            if not os.path.exists(audio_file_path):
+            try:
+                file_size = os.stat(audio_file_path).st_size
+            except FileNotFoundError:
                 return {
                     "success": False,
                     "error": f"Audio file not found: {audio_file_path}",
@@ -111,22 +343,50 @@ class LocalWhisperProcessor(SpeechProcessorInterface):
             if not language or not isinstance(language, str):
                 language = "en"
             
-            result = self.model.transcribe(audio_file_path, language=language)
-            
-            if result and "text" in result:
+            if file_size == 0:
+                # An empty recording is silence; no need to start ffmpeg and Whisper for it
                 return {
                     "success": True,
-                    "text": result["text"],
-                    "language": result.get("language", language),
+                    "text": "",
+                    "language": language,
                     "method": "local_whisper",
-                    "segments": result.get("segments", [])
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": "No transcription returned",
-                    "fallback_to": "web_speech_api"
+                    "segments": []
                 }
+            
+            return await self._transcribe(audio_file_path, language)
+        except Exception as e:
+            print(f"Whisper transcription error: {e}")
+            return {
+                "success": False,
+                "error": f"Whisper error: {str(e)}",
+                "fallback_to": "web_speech_api"
+            }
+    
+    async def speech_to_text_bytes(self, audio_bytes: bytes, language: str = "en") -> Dict[str, Any]:
+        """Convert in-memory speech to text using local Whisper, without a temporary file"""
+        if not audio_bytes or not isinstance(audio_bytes, (bytes, bytearray, memoryview)):
+            return {
+                "success": False,
+                "error": "Invalid audio data",
+                "fallback_to": "web_speech_api"
+            }
+        
+        if not self.whisper_available:
+            return {
+                "success": False,
+                "error": "Local Whisper not available - install with: pip install openai-whisper",
+                "fallback_to": "web_speech_api"
+            }
+        
+        try:
+            if not language or not isinstance(language, str):
+                language = "en"
+            
+            audio_bytes = bytes(audio_bytes)
+            # Identical clips arriving together (a class reading the same prompt) share one decode
+            key = hashlib.blake2b(audio_bytes, digest_size=16).hexdigest() + ":" + language
+            result = await _coalesced(self._inflight, key, lambda: self._transcribe_bytes(audio_bytes, language))
+            return dict(result)
         except Exception as e:
             print(f"Whisper transcription error: {e}")
             return {
@@ -135,6 +395,32 @@ class LocalWhisperProcessor(SpeechProcessorInterface):
                 "fallback_to": "web_speech_api"
             }
     
+    async def _transcribe_bytes(self, audio_bytes: bytes, language: str) -> Dict[str, Any]:
+        audio = await asyncio.get_running_loop().run_in_executor(_WHISPER_EXECUTOR, _decode_audio_bytes, audio_bytes)
+        return await self._transcribe(audio, language)
+    
+    async def _transcribe(self, audio, language: str) -> Dict[str, Any]:
+        """Run Whisper on a file path or a 16 kHz float32 waveform"""
+        # Loading and decoding are blocking, so keep them off the event loop
+        loop = asyncio.get_running_loop()
+        model = await loop.run_in_executor(_WHISPER_EXECUTOR, self._get_model)
+        result = await loop.run_in_executor(_WHISPER_EXECUTOR, self._decode, model, audio, language)
+        
+        if result and "text" in result:
+            return {
+                "success": True,
+                "text": result["text"],
+                "language": result.get("language", language),
+                "method": "local_whisper",
+                "segments": result.get("segments", [])
+            }
+        else:
+            return {
+                "success": False,
+                "error": "No transcription returned",
+                "fallback_to": "web_speech_api"
+            }
+    
     async def text_to_speech(self, text: str, voice: str = "alloy", language: str = "en") -> Dict[str, Any]:
         """Local Whisper doesn't support TTS"""
         return {
@@ -151,6 +437,88 @@ class HuggingFaceAPISpeechProcessor(SpeechProcessorInterface):
         self.stt_api_url = "https://api-inference.huggingface.co/models/facebook/wav2vec2-base-960h"
         self.tts_api_url = "https://api-inference.huggingface.co/models/facebook/fastspeech2-en-ljspeech"
         self.headers = {"Authorization": f"Bearer {self.api_token}"} if self.api_token else {}
+        self._session = None
+        self._stt_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Synthesized clips are kept as files; each caller gets its own copy
+        self._tts_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._stt_inflight: Dict[str, "asyncio.Task"] = {}
+        self._tts_inflight: Dict[tuple, "asyncio.Task"] = {}
+        # Created on first use so it binds to the serving event loop
+        self._request_slots = None
+    
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value, max_size: int, on_evict=None):
+        """Store a value in a bounded LRU cache"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            _, evicted = cache.popitem(last=False)
+            if on_evict is not None:
+                on_evict(evicted)
+    
+    @staticmethod
+    def _discard_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def _get_session(self):
+        """Shared HTTP session so concurrent requests reuse pooled keep-alive connections"""
+        if aiohttp is None:
+            raise RuntimeError("aiohttp not available - install with: pip install aiohttp")
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=100),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def _post(self, url: str, read_json: bool = False, save_to_file: bool = False,
+                    content_type: Optional[str] = None, **kwargs):
+        """POST to the inference API, returning (status, body) for a 200 and (status, None) otherwise.
+        With save_to_file the body is streamed to a temporary file and its path returned instead."""
+        headers = {**self.headers, "Content-Type": content_type} if content_type else self.headers
+        if self._request_slots is None:
+            self._request_slots = asyncio.Semaphore(_HF_MAX_IN_FLIGHT)
+        session = self._get_session()
+        for attempt in range(_HF_MAX_ATTEMPTS):
+            last_attempt = attempt == _HF_MAX_ATTEMPTS - 1
+            try:
+                async with self._request_slots:
+                    async with session.post(url, headers=headers, **kwargs) as response:
+                        status = response.status
+                        if status == 200:
+                            if save_to_file:
+                                return status, await self._stream_to_file(response)
+                            body = await response.json(content_type=None) if read_json else await response.read()
+                            return status, body
+            except aiohttp.ClientConnectionError:
+                if last_attempt:
+                    raise
+                status = None
+            if status is not None and (status not in _HF_RETRY_STATUSES or last_attempt):
+                return status, None
+            # Back off outside the semaphore so waiting retries don't hold up other requests
+            await asyncio.sleep(_HF_BACKOFF_SECONDS * (2 ** attempt))
+    
+    async def _stream_to_file(self, response) -> str:
+        """Write a response body to a temporary file chunk by chunk, so memory stays flat for long clips"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
+            try:
+                async for chunk in response.content.iter_chunked(_STREAM_CHUNK_BYTES):
+                    temp_file.write(chunk)
+            except BaseException:
+                temp_file.close()
+                self._discard_file(temp_file.name)
+                raise
+            return temp_file.name
+    
+    async def close(self):
+        """Release the pooled HTTP connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def speech_to_text(self, audio_file_path: str, language: str = "en") -> Dict[str, Any]:
         """Convert speech to text using Hugging Face API"""
@@ -163,20 +531,53 @@ class HuggingFaceAPISpeechProcessor(SpeechProcessorInterface):
         
         try:
             with open(audio_file_path, "rb") as audio_file:
-                audio_data = audio_file.read()
+                if os.fstat(audio_file.fileno()).st_size < _MMAP_MIN_BYTES:
+                    audio_data = audio_file.read()
+                    return await self.speech_to_text_bytes(audio_data, language)
+                # Larger clips are uploaded straight from the page cache instead of copied into a bytes object
+                mapped = mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    return await self.speech_to_text_bytes(memoryview(mapped), language)
+                finally:
+                    try:
+                        mapped.close()
+                    except BufferError:
+                        # Still being uploaded for other callers sharing this request; unmapped once they finish
+                        pass
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "fallback_to": "web_speech_api"
+            }
+    
+    async def speech_to_text_bytes(self, audio_data: bytes, language: str = "en") -> Dict[str, Any]:
+        """Convert in-memory speech to text using Hugging Face API"""
+        if not self.api_token:
+            return {
+                "success": False,
+                "error": "Hugging Face API token not configured",
+                "fallback_to": "web_speech_api"
+            }
+        
+        try:
+            cache_key = hashlib.blake2b(audio_data, digest_size=16).hexdigest() + ":" + language
+            cached = self._stt_cache.get(cache_key)
+            if cached is not None:
+                self._stt_cache.move_to_end(cache_key)
+                return dict(cached)
             
-            response = requests.post(
-                self.stt_api_url,
-                headers=self.headers,
-                data=audio_data,
-                timeout=30
-            )
+            async def upload():
+                payload, content_type = await asyncio.to_thread(_encode_for_upload, audio_data)
+                return await self._post(self.stt_api_url, read_json=True, content_type=content_type, data=payload)
             
-            if response.status_code == 200:
-                result = response.json()
-                
+            # Concurrent uploads of the same clip share one API call
+            status, result = await _coalesced(self._stt_inflight, cache_key, upload)
+            
+            transcription = None
+            if status == 200:
                 if isinstance(result, dict) and "text" in result:
-                    return {
+                    transcription = {
                         "success": True,
                         "text": result["text"],
                         "language": language,
@@ -185,16 +586,19 @@ class HuggingFaceAPISpeechProcessor(SpeechProcessorInterface):
                     }
                 elif isinstance(result, list) and len(result) > 0:
                     # Handle array response format
-                    return {
+                    transcription = {
                         "success": True,
                         "text": result[0].get("generated_text", ""),
                         "language": language,
                         "method": "huggingface_api"
                     }
+            if transcription is not None:
+                self._remember(self._stt_cache, cache_key, dict(transcription), _STT_CACHE_SIZE)
+                return transcription
             
             return {
                 "success": False,
-                "error": f"API request failed: {response.status_code}",
+                "error": f"API request failed: {status}",
                 "fallback_to": "web_speech_api"
             }
             
@@ -217,18 +621,25 @@ class HuggingFaceAPISpeechProcessor(SpeechProcessorInterface):
         try:
             payload = {"inputs": text}
             
-            response = requests.post(
-                self.tts_api_url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            cache_key = (text, voice, language)
+            cached_path = self._tts_cache.get(cache_key)
+            if cached_path is not None:
+                self._tts_cache.move_to_end(cache_key)
+                status = 200
+            else:
+                # Concurrent requests for the same phrase (a whole class on one prompt) share one call
+                status, cached_path = await _coalesced(
+                    self._tts_inflight, cache_key, lambda: self._post(self.tts_api_url, save_to_file=True, json=payload)
+                )
+                if status == 200 and self._tts_cache.get(cache_key) != cached_path:
+                    self._remember(self._tts_cache, cache_key, cached_path, _TTS_CACHE_SIZE, on_evict=self._discard_file)
             
-            if response.status_code == 200:
-                # Save audio to temporary file
+            if status == 200:
+                # Save audio to a temporary file of its own, since callers may delete it after serving;
+                # copyfile moves the bytes in the kernel rather than through Python
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_file:
-                    temp_file.write(response.content)
                     temp_file_path = temp_file.name
+                shutil.copyfile(cached_path, temp_file_path)
                 
                 return {
                     "success": True,
@@ -241,7 +652,7 @@ class HuggingFaceAPISpeechProcessor(SpeechProcessorInterface):
             
             return {
                 "success": False,
-                "error": f"API request failed: {response.status_code}",
+                "error": f"API request failed: {status}",
                 "fallback_to": "web_speech_api"
             }
             
@@ -301,8 +712,7 @@ class SpeechAnalyzer:
         errors = []
         
         if expected_text:
-            accuracy = self._calculate_accuracy(transcribed_text, expected_text)
-            word_errors = self._find_word_differences(transcribed_text, expected_text)
+            accuracy, word_errors = self._compare_words(transcribed_text, expected_text)
             errors.extend(word_errors)
         else:
             accuracy = 85.0  # Default when no expected text
@@ -321,42 +731,57 @@ class SpeechAnalyzer:
             "analysis_type": "lightweight"
         }
     
-    def _calculate_accuracy(self, transcribed: str, expected: str) -> float:
-        """Calculate word-level accuracy"""
+    def _compare_words(self, transcribed: str, expected: str) -> Tuple[float, list]:
+        """Word-level accuracy (1 - word error rate) and the differences behind it, from one alignment"""
         transcribed_words = transcribed.lower().split()
         expected_words = expected.lower().split()
         
         if not expected_words:
-            return 0.0
+            return 0.0, []
         
-        correct_words = sum(1 for t, e in zip(transcribed_words, expected_words) if t == e)
-        return round((correct_words / len(expected_words)) * 100, 2)
-    
-    def _find_word_differences(self, transcribed: str, expected: str) -> list:
-        """Find word-level differences"""
-        errors = []
-        transcribed_words = transcribed.lower().split()
-        expected_words = expected.lower().split()
+        # Align the sequences so one skipped or extra word doesn't shift every later comparison
+        edits = _word_editops(expected_words, transcribed_words)
+        accuracy = round(max(0.0, 1 - len(edits) / len(expected_words)) * 100, 2)
         
-        for i, (trans, exp) in enumerate(zip(transcribed_words, expected_words)):
-            if trans != exp:
+        errors = []
+        for op, exp_pos, said_pos in edits:
+            if op == "replace":
+                trans, exp = transcribed_words[said_pos], expected_words[exp_pos]
                 errors.append({
                     "type": "pronunciation_error",
-                    "position": i,
+                    "position": exp_pos,
                     "said": trans,
                     "expected": exp,
                     "suggestion": f"Practice saying '{exp}' instead of '{trans}'"
                 })
+            elif op == "delete":
+                exp = expected_words[exp_pos]
+                errors.append({
+                    "type": "missing_word",
+                    "position": exp_pos,
+                    "said": "",
+                    "expected": exp,
+                    "suggestion": f"Remember to say '{exp}'"
+                })
+            else:
+                trans = transcribed_words[said_pos]
+                errors.append({
+                    "type": "extra_word",
+                    "position": exp_pos,
+                    "said": trans,
+                    "expected": "",
+                    "suggestion": f"'{trans}' isn't in the text - try leaving it out"
+                })
         
-        return errors
+        return accuracy, errors
     
     def _check_speech_patterns(self, text: str) -> list:
         """Check for common dyslexic speech patterns"""
-        import re
         errors = []
+        lower = text.lower()
         
         # Check for word repetitions
-        repetitions = re.findall(r'\b(\w+)\s+\1\b', text.lower())
+        repetitions = _REPETITION_RE.findall(lower)
         for rep in repetitions:
             errors.append({
                 "type": "word_repetition",
@@ -365,9 +790,9 @@ class SpeechAnalyzer:
             })
         
         # Check for filler words (excessive use)
-        fillers = ["um", "uh", "like", "you know"]
-        words = text.lower().split()
-        filler_count = sum(1 for word in words if word in fillers)
+        words = lower.split()
+        filler_count = sum(1 for word in words if word in _FILLERS)
+        filler_count += sum(1 for bigram in zip(words, words[1:]) if bigram in _BIGRAM_FILLERS)
         
         if filler_count > len(words) * 0.1:  # More than 10% fillers
             errors.append({
@@ -382,7 +807,9 @@ class SpeechProcessorFactory:
     """Factory to create speech processor based on configuration"""
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def create_processor() -> SpeechProcessorInterface:
+        # Providers are stateless apart from pooled connections and shared models, so one per process
         provider = getattr(settings, 'SPEECH_PROVIDER', 'web_speech_api')
         
         if provider == "web_speech_api":
@@ -400,14 +827,18 @@ class SpeechProcessorFactory:
 class SpeechProcessorAlternative:
     """Alternative speech processor that combines multiple providers"""
     
-    def __init__(self):
-        self.processor = SpeechProcessorFactory.create_processor()
+    def __init__(self, processor: Optional[SpeechProcessorInterface] = None):
+        self.processor = processor or SpeechProcessorFactory.create_processor()
         self.analyzer = SpeechAnalyzer()
     
     async def process_speech_to_text(self, audio_file_path: str, language: str = "en") -> Dict[str, Any]:
         """Process speech to text with fallback options"""
         return await self.processor.speech_to_text(audio_file_path, language)
     
+    async def process_speech_to_text_bytes(self, audio_bytes: bytes, language: str = "en") -> Dict[str, Any]:
+        """Process in-memory speech to text with fallback options"""
+        return await self.processor.speech_to_text_bytes(audio_bytes, language)
+    
     async def process_text_to_speech(self, text: str, voice: str = "alloy", language: str = "en") -> Dict[str, Any]:
         """Process text to speech with fallback options"""
         return await self.processor.text_to_speech(text, voice, language)
@@ -415,6 +846,11 @@ class SpeechProcessorAlternative:
     async def analyze_speech(self, transcribed_text: str, expected_text: str = None) -> Dict[str, Any]:
         """Analyze speech for errors and patterns"""
         return await self.analyzer.analyze_speech_errors(transcribed_text, expected_text)
+    
+    async def close(self):
+        """Release any network resources held by the provider"""
+        if hasattr(self.processor, "close"):
+            await self.processor.close()
 
 # Initialize the speech processor and analyzer
 speech_processor = SpeechProcessorFactory.create_processor()
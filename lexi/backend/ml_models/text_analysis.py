@@ -1,11 +1,103 @@
 import re
+import string
 import json
-import requests
+import operator
+import os
 import asyncio
+import difflib
+import functools
+import importlib.util
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
 from config import settings
+from ._corrections import CORRECTIONS, CORRECTION_RE, PHONETIC_WORDS, REVERSAL_WORDS, WORD_CHECKS
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Error type, suggestion template and colour key for each whole-word pattern
+_PATTERN_ERRORS = {
+    'letter_reversal': ('letter_reversal', "Check if '{}' should be a different word", 'reversal'),
+    'phonetic': ('phonetic_error', "Consider the correct spelling of '{}'", 'phonetic')
+}
+
+# Pooled client shared by the API analyzers, created on first use
+_http_client = None
+
+def _get_http_client():
+    global _http_client
+    if httpx is None:
+        raise RuntimeError("httpx not available - install with: pip install httpx")
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=32))
+    return _http_client
+
+# Dedicated pool for BERT analyses, kept apart from the default executor and sized so
+# that its workers times torch's intra-op threads stays within the physical cores
+_BERT_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("BERT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2)))), thread_name_prefix="bert"
+)
+_BERT_TORCH_THREADS = int(os.getenv("BERT_TORCH_THREADS", "2"))
+
+# (whole second, ISO string) of the last result timestamp
+_timestamp_cache = (None, "")
+
+def _utc_timestamp() -> str:
+    """UTC ISO timestamp for analysis results, formatted at most once per second"""
+    global _timestamp_cache
+    second = int(time.time())
+    cached_second, formatted = _timestamp_cache
+    if cached_second != second:
+        formatted = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_cache = (second, formatted)
+    return formatted
+
+_WORD_RE = re.compile(r'\w+')
+_TOKEN_RE = re.compile(r'\S+')
+# ASCII punctuation, less the underscore that \w counts as a word character
+_EDGE_PUNCTUATION = string.punctuation.replace('_', '')
+_NO_MATCH = (None, None)
+
+def _lower_in_place(text: str) -> str:
+    """Lowercase text without changing its length, so offsets map back to the original"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A handful of characters lowercase to two; leave those alone
+    return ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+def _wrap_words(text: str, marks: List[Tuple[str, str]]) -> str:
+    """Replace the first unclaimed case-insensitive occurrence of each word with its markup,
+    stitching the result together in one pass instead of rewriting the text per word"""
+    text_lower = _lower_in_place(text)
+    spans = []
+    for word, markup in marks:
+        word_lower = word.lower()
+        pos = text_lower.find(word_lower)
+        while pos != -1 and any(start < pos + len(word) and pos < end for start, end, _ in spans):
+            pos = text_lower.find(word_lower, pos + 1)
+        if pos != -1:
+            spans.append((pos, pos + len(word), markup))
+    
+    spans.sort()
+    parts = []
+    last = 0
+    for start, end, markup in spans:
+        parts.append(text[last:start])
+        parts.append(markup)
+        last = end
+    parts.append(text[last:])
+    return ''.join(parts)
 
 class TextAnalyzerInterface(ABC):
     """Interface for text analysis providers"""
@@ -17,33 +109,32 @@ class TextAnalyzerInterface(ABC):
     @abstractmethod
     def get_highlighted_text(self, text: str, errors: List[Dict]) -> str:
         pass
+    
+    async def close(self):
+        """Release the pooled HTTP connections used by the API analyzers"""
+        global _http_client
+        if _http_client is not None and not _http_client.is_closed:
+            await _http_client.aclose()
+        _http_client = None
 
 class SimpleLocalAnalyzer(TextAnalyzerInterface):
     """Lightweight local text analyzer without heavy ML dependencies"""
     
+    # Compiled once for the class rather than per instance
+    error_patterns = {
+        'letter_reversal': re.compile(r'\b(' + '|'.join(REVERSAL_WORDS) + r')\b'),
+        'phonetic': re.compile(r'\b(' + '|'.join(PHONETIC_WORDS) + r')\b'),
+        'double_letters': re.compile(r'\b\w*([bcdfghjklmnpqrstvwxyz])\1{2,}\w*\b'),
+        'missing_letters': re.compile(r'\b[bcdfghjklmnpqrstvwxyz]{3,}[aeiou][bcdfghjklmnpqrstvwxyz]{3,}\b')
+    }
+    
     def __init__(self):
-        # Common dyslexic error patterns - lightweight rule-based approach
-        self.spelling_corrections = {
-            # Common reversals and confusions
-            'teh': 'the', 'hte': 'the', 'thier': 'their', 'recieve': 'receive',
-            'beleive': 'believe', 'seperate': 'separate', 'definately': 'definitely',
-            'occured': 'occurred', 'neccessary': 'necessary', 'begining': 'beginning',
-            'alot': 'a lot', 'wierd': 'weird', 'freind': 'friend',
-            # b/d reversals
-            'abd': 'and', 'doy': 'boy', 'bid': 'did', 'dack': 'back',
-            # p/q reversals  
-            'qut': 'put', 'puite': 'quite',
-            # Common phonetic errors
-            'lite': 'light', 'nite': 'night', 'wuz': 'was', 'sed': 'said',
-            # Single letter errors (common with dyslexia)
-            'oog': 'dog', 'og': 'dog', 'qan': 'can', 'pan': 'pan', 'ban': 'ban',
-            'bog': 'dog', 'cog': 'dog', 'fog': 'fog', 'hog': 'hog', 'jog': 'jog', 'log': 'log',
-            # Common misspellings
-            'stuby': 'study', 'tum': 'them', 'i': 'I'
-        }
+        # Shared read-only tables, the same objects for every analyzer
+        self.spelling_corrections = CORRECTIONS
+        self._word_checks = WORD_CHECKS
         
         # Common English words for spell-checking
-        self.common_words = {
+        self.common_words = frozenset({
             'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
             'is', 'are', 'was', 'were', 'be', 'been', 'being',
             'have', 'has', 'had', 'do', 'does', 'did',
@@ -55,14 +146,7 @@ class SimpleLocalAnalyzer(TextAnalyzerInterface):
             'boy', 'girl', 'man', 'woman', 'child', 'baby', 'mom', 'dad', 'friend',
             'book', 'pen', 'paper', 'desk', 'chair', 'house', 'school', 'car', 'tree',
             'study', 'them', 'i'
-        }
-        
-        self.error_patterns = {
-            'letter_reversal': r'\b(abd|doy|bid|dack|qut|puite)\b',
-            'phonetic': r'\b(lite|nite|wuz|sed|cuz|becuz)\b',
-            'double_letters': r'\b\w*([bcdfghjklmnpqrstvwxyz])\1{2,}\w*\b',
-            'missing_letters': r'\b[bcdfghjklmnpqrstvwxyz]{3,}[aeiou][bcdfghjklmnpqrstvwxyz]{3,}\b'
-        }
+        })
         
         self.color_map = {
             'spelling': '#FF6B6B',
@@ -73,6 +157,10 @@ class SimpleLocalAnalyzer(TextAnalyzerInterface):
     
     async def analyze_text(self, text: str) -> Dict[str, Any]:
         """Analyze text using lightweight rule-based approach"""
+        return self._analyze_sync(text)
+    
+    def _analyze_sync(self, text: str) -> Dict[str, Any]:
+        """Rule-based analysis; nothing here awaits, so fallbacks can call it directly"""
         # Input validation and handling
         if not text or not isinstance(text, str):
             return {
@@ -95,14 +183,30 @@ class SimpleLocalAnalyzer(TextAnalyzerInterface):
         
         try:
             errors = []
-            corrected_text = text
+            pattern_errors = {pattern: [] for pattern in _PATTERN_ERRORS}
+            corrections = []
             words = text.lower().split()
+            word_checks = self._word_checks
             
-            # Check spelling corrections
+            # A single pass over the words covers the spelling table and the whole-word patterns;
+            # a pattern can only match a run of word characters, so each token's runs are looked up too
             for i, word in enumerate(words):
-                clean_word = re.sub(r'[^\w]', '', word)
-                if clean_word in self.spelling_corrections:
-                    correct_word = self.spelling_corrections[clean_word]
+                if word.isalnum():
+                    correct_word, pattern = word_checks.get(word, _NO_MATCH)
+                    if pattern is not None:
+                        pattern_errors[pattern].append(word)
+                else:
+                    # Punctuation only at the edges ("teh,", "(lite)") leaves a single run, stripped in C;
+                    # anything else is split into its word-character runs
+                    stripped = word.strip(_EDGE_PUNCTUATION)
+                    parts = (stripped,) if stripped.isalnum() else _WORD_RE.findall(word)
+                    correct_word = word_checks.get(''.join(parts), _NO_MATCH)[0]
+                    for part in parts:
+                        pattern = word_checks.get(part, _NO_MATCH)[1]
+                        if pattern is not None:
+                            pattern_errors[pattern].append(part)
+                
+                if correct_word is not None:
                     errors.append({
                         'type': 'spelling',
                         'word': word,
@@ -110,33 +214,20 @@ class SimpleLocalAnalyzer(TextAnalyzerInterface):
                         'suggestion': correct_word,
                         'color': self.color_map['spelling']
                     })
-                    corrected_text = corrected_text.replace(word, correct_word, 1)
-        
-            # Check for letter reversals
-            try:
-                reversal_matches = re.finditer(self.error_patterns['letter_reversal'], text.lower())
-                for match in reversal_matches:
-                    errors.append({
-                        'type': 'letter_reversal',
-                        'word': match.group(),
-                        'suggestion': f"Check if '{match.group()}' should be a different word",
-                        'color': self.color_map['reversal']
-                    })
-            except Exception as e:
-                print(f"Error in reversal detection: {e}")
+                    corrections.append((i, correct_word))
             
-            # Check phonetic errors
-            try:
-                phonetic_matches = re.finditer(self.error_patterns['phonetic'], text.lower())
-                for match in phonetic_matches:
+            corrected_text = self._apply_corrections(text, corrections)
+            
+            # Letter reversals, then phonetic errors, each in text order
+            for pattern, matches in pattern_errors.items():
+                error_type, suggestion, color_key = _PATTERN_ERRORS[pattern]
+                for match in matches:
                     errors.append({
-                        'type': 'phonetic_error',
-                        'word': match.group(),
-                        'suggestion': f"Consider the correct spelling of '{match.group()}'",
-                        'color': self.color_map['phonetic']
+                        'type': error_type,
+                        'word': match,
+                        'suggestion': suggestion.format(match),
+                        'color': self.color_map[color_key]
                     })
-            except Exception as e:
-                print(f"Error in phonetic detection: {e}")
             
             confidence = self._calculate_confidence(len(words), len(errors))
             
@@ -160,6 +251,35 @@ class SimpleLocalAnalyzer(TextAnalyzerInterface):
                 'analysis_type': 'error_fallback'
             }
     
+    @staticmethod
+    def _apply_corrections(text: str, corrections: List[Tuple[int, str]]) -> str:
+        """Rewrite the misspelt words, given as (word index, correction), in one pass over the text.
+        Edge punctuation around a word, and its leading capital, are kept."""
+        if not corrections:
+            return text
+        
+        replacements = dict(corrections)
+        parts = []
+        last = 0
+        for i, token in enumerate(_TOKEN_RE.finditer(text)):
+            correct_word = replacements.get(i)
+            if correct_word is None:
+                continue
+            start, end = token.span()
+            core = token.group().strip(_EDGE_PUNCTUATION)
+            if core.isalnum():
+                start += token.group().index(core)
+                end = start + len(core)
+            if core[:1].isupper():
+                correct_word = correct_word[:1].upper() + correct_word[1:]
+            parts.append(text[last:start])
+            parts.append(correct_word)
+            last = end
+            if len(parts) == 2 * len(replacements):
+                break
+        parts.append(text[last:])
+        return ''.join(parts)
+    
     def get_highlighted_text(self, text: str, errors: List[Dict]) -> str:
         """Return HTML with highlighted errors"""
         if not text or not isinstance(text, str):
@@ -168,27 +288,21 @@ class SimpleLocalAnalyzer(TextAnalyzerInterface):
         if not errors or not isinstance(errors, list):
             return text
         
-        highlighted_text = text
-        
         try:
+            marks = []
             for error in errors:
                 if 'word' in error and error['word']:
                     word = error['word']
                     color = error.get('color', '#FF6B6B')
                     suggestion = error.get('suggestion', 'Error detected')
-                    
-                    highlighted_text = re.sub(
-                        re.escape(word),
-                        f'<span style="background-color: {color}; padding: 2px 4px; border-radius: 3px;" title="{suggestion}">{word}</span>',
-                        highlighted_text,
-                        count=1,
-                        flags=re.IGNORECASE
-                    )
+                    marks.append((
+                        word,
+                        f'<span style="background-color: {color}; padding: 2px 4px; border-radius: 3px;" title="{suggestion}">{word}</span>'
+                    ))
+            return _wrap_words(text, marks)
         except Exception as e:
             print(f"Error in highlighting: {e}")
             return text
-        
-        return highlighted_text
     
     def _calculate_confidence(self, word_count: int, error_count: int) -> float:
         """Calculate confidence score"""
@@ -204,6 +318,9 @@ class SimpleLocalAnalyzer(TextAnalyzerInterface):
             print(f"Error calculating confidence: {e}")
             return 0.5
 
+# Shared by the API and BERT analyzers for their local fallback
+_fallback_analyzer = SimpleLocalAnalyzer()
+
 class HuggingFaceAPIAnalyzer(TextAnalyzerInterface):
     """Use Hugging Face Inference API for text analysis"""
     
@@ -211,18 +328,18 @@ class HuggingFaceAPIAnalyzer(TextAnalyzerInterface):
         self.api_token = settings.HUGGINGFACE_TOKEN
         self.api_url = "https://api-inference.huggingface.co/models/microsoft/DialoGPT-medium"
         self.headers = {"Authorization": f"Bearer {self.api_token}"} if self.api_token else {}
+        self.fallback_analyzer = _fallback_analyzer
     
     async def analyze_text(self, text: str) -> Dict[str, Any]:
         """Analyze text using Hugging Face API"""
         if not self.api_token:
             # Fallback to simple analyzer
-            simple_analyzer = SimpleLocalAnalyzer()
-            return await simple_analyzer.analyze_text(text)
+            return self.fallback_analyzer._analyze_sync(text)
         
         try:
             # Use grammar checking model via API
             payload = {"inputs": text}
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=10)
+            response = await _get_http_client().post(self.api_url, headers=self.headers, json=payload, timeout=10)
             
             if response.status_code == 200:
                 # Process API response and format as needed
@@ -237,19 +354,16 @@ class HuggingFaceAPIAnalyzer(TextAnalyzerInterface):
                 }
             else:
                 # Fallback to local analyzer
-                simple_analyzer = SimpleLocalAnalyzer()
-                return await simple_analyzer.analyze_text(text)
+                return self.fallback_analyzer._analyze_sync(text)
                 
         except Exception as e:
             print(f"HF API Error: {e}")
             # Fallback to local analyzer
-            simple_analyzer = SimpleLocalAnalyzer()
-            return await simple_analyzer.analyze_text(text)
+            return self.fallback_analyzer._analyze_sync(text)
     
     def get_highlighted_text(self, text: str, errors: List[Dict]) -> str:
         # Use same highlighting logic as simple analyzer
-        simple_analyzer = SimpleLocalAnalyzer()
-        return simple_analyzer.get_highlighted_text(text, errors)
+        return self.fallback_analyzer.get_highlighted_text(text, errors)
 
 class OpenAIAPIAnalyzer(TextAnalyzerInterface):
     """Use OpenAI API for text analysis"""
@@ -257,13 +371,13 @@ class OpenAIAPIAnalyzer(TextAnalyzerInterface):
     def __init__(self):
         self.api_key = settings.OPENAI_API_KEY
         self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.fallback_analyzer = _fallback_analyzer
     
     async def analyze_text(self, text: str) -> Dict[str, Any]:
         """Analyze text using OpenAI API"""
         if not self.api_key:
             # Fallback to simple analyzer
-            simple_analyzer = SimpleLocalAnalyzer()
-            return await simple_analyzer.analyze_text(text)
+            return self.fallback_analyzer._analyze_sync(text)
         
         try:
             headers = {
@@ -287,7 +401,7 @@ class OpenAIAPIAnalyzer(TextAnalyzerInterface):
                 "temperature": 0.3
             }
             
-            response = requests.post(self.api_url, headers=headers, json=payload, timeout=15)
+            response = await _get_http_client().post(self.api_url, headers=headers, json=payload, timeout=15)
             
             if response.status_code == 200:
                 result = response.json()
@@ -299,23 +413,80 @@ class OpenAIAPIAnalyzer(TextAnalyzerInterface):
                     return analysis
                 except json.JSONDecodeError:
                     # Fallback to simple analyzer
-                    simple_analyzer = SimpleLocalAnalyzer()
-                    return await simple_analyzer.analyze_text(text)
+                    return self.fallback_analyzer._analyze_sync(text)
             else:
                 # Fallback to simple analyzer
-                simple_analyzer = SimpleLocalAnalyzer()
-                return await simple_analyzer.analyze_text(text)
+                return self.fallback_analyzer._analyze_sync(text)
                 
         except Exception as e:
             print(f"OpenAI API Error: {e}")
             # Fallback to simple analyzer  
-            simple_analyzer = SimpleLocalAnalyzer()
-            return await simple_analyzer.analyze_text(text)
+            return self.fallback_analyzer._analyze_sync(text)
     
     def get_highlighted_text(self, text: str, errors: List[Dict]) -> str:
         # Use same highlighting logic as simple analyzer
-        simple_analyzer = SimpleLocalAnalyzer()
-        return simple_analyzer.get_highlighted_text(text, errors)
+        return self.fallback_analyzer.get_highlighted_text(text, errors)
+
+class _BertBatcher:
+    """Coalesce embedding requests from concurrent analyses into one padded forward pass"""
+    
+    def __init__(self, tokenizer, model, max_batch: int = 16, max_wait: float = 0.005):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+    
+    def embed(self, texts: List[str]) -> List[Any]:
+        """Return the [CLS] embedding of each text, blocking until its batch has run"""
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        self._ensure_worker()
+        return [future.result() for future in futures]
+    
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="bert-batcher", daemon=True)
+                    self._worker.start()
+    
+    def _run(self):
+        while True:
+            # Wait for one request, then gather whatever else arrives within max_wait
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._forward(batch)
+    
+    def _forward(self, batch: List[Tuple[str, Future]]):
+        try:
+            import torch
+            
+            inputs = self.tokenizer(
+                [text for text, _ in batch], padding=True, truncation=True, max_length=512, return_tensors="pt"
+            )
+            with torch.inference_mode():
+                outputs = self.model(**inputs)
+                rows = outputs.last_hidden_state[:, 0, :].numpy()
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), row in zip(batch, rows):
+            future.set_result(row)
 
 class BERTTextAnalyzer(TextAnalyzerInterface):
     """BERT-based text analyzer for dyslexic errors with async support"""
@@ -324,51 +495,81 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
         self.model = None
         self.tokenizer = None
         self.grammar_checker = None
-        self.bert_available = False
-        self.fallback_analyzer = SimpleLocalAnalyzer()
-        
-        try:
-            from transformers import AutoTokenizer, AutoModel, pipeline
-            import torch
-            
-            # Use lightweight BERT model
-            model_name = "distilbert-base-uncased"
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-            self.model = AutoModel.from_pretrained(model_name)
-            self.model.eval()
-            
-            # Grammar checker pipeline
+        self._batcher = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self.fallback_analyzer = _fallback_analyzer
+        
+        # Only check the dependencies here; importing them and loading the model waits for the first analysis
+        self.bert_available = (
+            importlib.util.find_spec("transformers") is not None and importlib.util.find_spec("torch") is not None
+        )
+        if not self.bert_available:
+            print("BERT dependencies not available (transformers/torch), falling back to simple analyzer")
+    
+    def _ensure_loaded(self):
+        """Load the model on first use; concurrent first analyses wait for the same load"""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
             try:
-                self.grammar_checker = pipeline("text2text-generation", 
-                                              model="grammarly/coedit-large", 
-                                              tokenizer="grammarly/coedit-large")
+                from transformers import AutoTokenizer, AutoModel, pipeline
+                import torch
+                
+                torch.set_num_threads(_BERT_TORCH_THREADS)
+                
+                # Use lightweight BERT model
+                model_name = "distilbert-base-uncased"
+                self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+                self.model = AutoModel.from_pretrained(model_name)
+                self.model.eval()
+                # Dynamic int8 weights for the Linear layers, which dominate DistilBERT inference on CPU
+                try:
+                    self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+                except Exception as e:
+                    print(f"BERT quantization unavailable, using float32 weights: {e}")
+                self._batcher = _BertBatcher(self.tokenizer, self.model)
+                
+                # Grammar checker pipeline
+                try:
+                    self.grammar_checker = pipeline("text2text-generation", 
+                                                  model="grammarly/coedit-large", 
+                                                  tokenizer="grammarly/coedit-large")
+                except Exception as e:
+                    print(f"Grammar checker model not available: {e}")
+                
+                print("BERT model loaded successfully")
+                
+            except ImportError:
+                print("BERT dependencies not available (transformers/torch), falling back to simple analyzer")
+                self.bert_available = False
             except Exception as e:
-                print(f"Grammar checker model not available: {e}")
-            
-            self.bert_available = True
-            print("BERT model loaded successfully")
-            
-        except ImportError:
-            print("BERT dependencies not available (transformers/torch), falling back to simple analyzer")
-        except Exception as e:
-            print(f"BERT model loading failed: {e}")
+                print(f"BERT model loading failed: {e}")
+                self.bert_available = False
+            self._loaded = True
     
     async def analyze_text(self, text: str) -> Dict[str, Any]:
         """Analyze text using BERT model (async wrapper)"""
         if not self.bert_available:
-            return await self.fallback_analyzer.analyze_text(text)
+            return self.fallback_analyzer._analyze_sync(text)
         
         try:
             # Run BERT analysis in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self._analyze_with_bert, text)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(_BERT_EXECUTOR, self._analyze_with_bert, text)
             return result
         except Exception as e:
             print(f"BERT analysis error: {e}")
-            return await self.fallback_analyzer.analyze_text(text)
+            return self.fallback_analyzer._analyze_sync(text)
     
     def _analyze_with_bert(self, text: str) -> Dict[str, Any]:
         """Synchronous BERT analysis"""
+        self._ensure_loaded()
+        if not self.bert_available:
+            return self.fallback_analyzer._analyze_sync(text)
+        
         try:
             # Get BERT embeddings
             embeddings = self._get_bert_embeddings(text)
@@ -392,34 +593,25 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
                 "error_count": len(enhanced_errors),
                 "confidence_score": confidence,
                 "analysis_type": "bert_enhanced",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _utc_timestamp()
             }
         except Exception as e:
             print(f"BERT analysis failed: {e}")
-            # Fallback to simple analysis
-            import asyncio
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            return loop.run_until_complete(self.fallback_analyzer.analyze_text(text))
-    
-    def _get_bert_embeddings(self, text: str) -> Optional[List[float]]:
-        """Get BERT embeddings for text"""
+            # Fallback to simple analysis; this runs in a worker thread, so call it synchronously
+            return self.fallback_analyzer._analyze_sync(text)
+    
+    def _get_bert_embeddings(self, text: str) -> Optional[bytes]:
+        """Get the BERT embedding for text, packed as float16 bytes"""
+        embeddings = self._get_bert_embeddings_batch([text])
+        return embeddings[0].astype(np.float16).tobytes() if embeddings else None
+    
+    def _get_bert_embeddings_batch(self, texts: List[str]) -> Optional[List[Any]]:
+        """Get BERT embeddings for several texts, batched with any other analyses in flight"""
         if not self.bert_available:
             return None
         
         try:
-            import torch
-            
-            inputs = self.tokenizer(text, return_tensors="pt", truncate=True, max_length=512)
-            
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                embeddings = outputs.last_hidden_state[0][0].numpy().tolist()
-            
-            return embeddings[:50]  # Truncate for storage
+            return self._batcher.embed(texts)
         except Exception as e:
             print(f"BERT embedding error: {e}")
             return None
@@ -434,29 +626,43 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
             print(f"Grammar checker error: {e}")
         
         # Fallback to simple corrections
-        corrected = text
-        corrections = {
-            "recieve": "receive", "seperate": "separate", 
-            "definately": "definitely", "occured": "occurred",
-            "nite": "night", "lite": "light", "thier": "their",
-            "teh": "the", "hte": "the", "beleive": "believe"
-        }
-        for wrong, right in corrections.items():
-            corrected = re.sub(rf'\b{wrong}\b', right, corrected, flags=re.IGNORECASE)
-        return corrected
+        return CORRECTION_RE.sub(lambda match: CORRECTIONS[match.group(1).casefold()], text)
     
     def _find_differences(self, original: str, corrected: str) -> List[Dict[str, Any]]:
         """Find differences between original and corrected text"""
+        # The grammar checker often hands the text back unchanged
+        if original == corrected:
+            return []
+        
         errors = []
         original_words = original.split()
         corrected_words = corrected.split()
+        original_lower = [word.lower() for word in original_words]
+        corrected_lower = [word.lower() for word in corrected_words]
         
-        for i, (orig, corr) in enumerate(zip(original_words, corrected_words)):
-            if orig.lower() != corr.lower():
+        if len(original_words) == len(corrected_words):
+            # Word-for-word substitutions line up by position
+            pairs = [(i, i, i + 1) for i in range(len(original_words))]
+        else:
+            # Words were added or dropped; align the two texts so the words after the change still pair up
+            pairs = []
+            matcher = difflib.SequenceMatcher(a=original_lower, b=corrected_lower, autojunk=False)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag != "replace":
+                    continue
+                pairs.extend((i, j, j + 1) for i, j in zip(range(i1, i2 - 1), range(j1, j2)))
+                # Extra corrected words go to the last original one, e.g. "alot" -> "a lot"
+                last = j1 + (i2 - i1) - 1
+                if last < j2:
+                    pairs.append((i2 - 1, last, j2))
+        
+        for i, j1, j2 in pairs:
+            suggestion = " ".join(corrected_words[j1:j2])
+            if original_lower[i] != suggestion.lower():
                 errors.append({
                     "type": "correction",
-                    "word": orig,
-                    "suggestion": corr,
+                    "word": original_words[i],
+                    "suggestion": suggestion,
                     "position": i,
                     "severity": "medium"
                 })
@@ -467,11 +673,11 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
         """Enhance error analysis with BERT context understanding"""
         enhanced_errors = []
         
-        for error in errors:
+        # Add context analysis, one embedding batch for every error's window
+        context_scores = self._get_context_relevances(text, [error.get('position', 0) for error in errors])
+        
+        for error, context_score in zip(errors, context_scores):
             enhanced_error = error.copy()
-            
-            # Add context analysis
-            context_score = self._get_context_relevance(text, error.get('position', 0))
             enhanced_error['context_confidence'] = context_score
             
             # Classify error type
@@ -490,30 +696,34 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
         
         return enhanced_errors
     
-    def _get_context_relevance(self, text: str, position: int) -> float:
-        """Calculate context relevance using BERT understanding"""
+    def _get_context_relevances(self, text: str, positions: List[int]) -> List[float]:
+        """Calculate context relevance for each position using BERT understanding"""
         words = text.split()
-        if position >= len(words):
-            return 0.5
+        scores = [0.5 if position >= len(words) else 0.7 for position in positions]
         
-        # Get context window
+        # Get context windows
         context_size = 3
-        start = max(0, position - context_size)
-        end = min(len(words), position + context_size + 1)
-        context = ' '.join(words[start:end])
+        indexes = []
+        contexts = []
+        for index, position in enumerate(positions):
+            if position < len(words):
+                start = max(0, position - context_size)
+                end = min(len(words), position + context_size + 1)
+                indexes.append(index)
+                contexts.append(' '.join(words[start:end]))
         
         # Use BERT embeddings to assess context coherence
-        if self.bert_available:
+        if self.bert_available and contexts:
             try:
-                embeddings = self._get_bert_embeddings(context)
+                embeddings = self._get_bert_embeddings_batch(contexts)
                 if embeddings:
-                    import numpy as np
-                    coherence = np.mean(np.abs(embeddings[:10]))
-                    return min(1.0, coherence)
+                    for index, embedding in zip(indexes, embeddings):
+                        if len(embedding):
+                            scores[index] = min(1.0, np.mean(np.abs(embedding[:10]), dtype=np.float64))
             except:
                 pass
         
-        return 0.7
+        return scores
     
     def _classify_error_type(self, original: str, corrected: str) -> str:
         """Classify error type using BERT understanding"""
@@ -521,7 +731,7 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
             return "unknown"
         
         if len(original) == len(corrected):
-            diff_chars = sum(1 for a, b in zip(original, corrected) if a != b)
+            diff_chars = sum(map(operator.ne, original, corrected))
             if diff_chars == 1:
                 return "single_char_substitution"
             elif diff_chars == 2:
@@ -541,8 +751,13 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
         if word_count > 50:
             base_confidence += 0.1
         
-        high_severity = sum(1 for e in errors if e.get('severity') == 'high')
-        medium_severity = sum(1 for e in errors if e.get('severity') == 'medium')
+        high_severity = medium_severity = 0
+        for e in errors:
+            severity = e.get('severity')
+            if severity == 'high':
+                high_severity += 1
+            elif severity == 'medium':
+                medium_severity += 1
         
         severity_penalty = (high_severity * 0.15) + (medium_severity * 0.08)
         base_confidence -= severity_penalty
@@ -560,9 +775,8 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
         if not errors or not isinstance(errors, list):
             return text
         
-        highlighted = text
-        
         try:
+            marks = []
             for error in errors:
                 if not error or not isinstance(error, dict):
                     continue
@@ -577,19 +791,14 @@ class BERTTextAnalyzer(TextAnalyzerInterface):
                         "low": "#A8E6CF"
                     }
                     color = color_map.get(severity, "#FFE66D")
-                    
-                    highlighted = re.sub(
-                        re.escape(word),
-                        f'<mark style="background-color: {color}; padding: 2px 4px; border-radius: 3px;" title="Suggestion: {suggestion}">{word}</mark>',
-                        highlighted,
-                        count=1,
-                        flags=re.IGNORECASE
-                    )
+                    marks.append((
+                        word,
+                        f'<mark style="background-color: {color}; padding: 2px 4px; border-radius: 3px;" title="Suggestion: {suggestion}">{word}</mark>'
+                    ))
+            return _wrap_words(text, marks)
         except Exception as e:
             print(f"Error in BERT highlighting: {e}")
             return text
-        
-        return highlighted
 
 
 class TextAnalyzerFactory:
@@ -611,5 +820,13 @@ class TextAnalyzerFactory:
             # Default fallback
             return SimpleLocalAnalyzer()
 
-# Initialize the analyzer
-text_analyzer = TextAnalyzerFactory.create_analyzer()
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def get_text_analyzer() -> TextAnalyzerInterface:
+    """Get the shared text analyzer for the configured provider, creating it on first use"""
+    return TextAnalyzerFactory.create_analyzer()
+
+def __getattr__(name: str) -> Any:
+    # Keep `from .text_analysis import text_analyzer` working without creating the analyzer at import time
+    if name == "text_analyzer":
+        return get_text_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,6 +1,27 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_serializer, field_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+import base64
+import numpy as np
+
+def _pack_embedding(value: Any) -> Any:
+    """Accept an embedding as a float sequence or NumPy vector, packed float16 bytes, or their base64 text"""
+    if value is None or isinstance(value, (bytes, bytearray)):
+        return value
+    if isinstance(value, str):
+        return base64.b64decode(value)
+    try:
+        with np.errstate(over="raise"):
+            vector = np.asarray(value, dtype="<f2")
+    except (TypeError, ValueError, FloatingPointError) as e:
+        raise ValueError(f"embedding is not representable as float16: {e}")
+    if vector.ndim != 1:
+        raise ValueError("embedding must be a single vector")
+    return vector.tobytes()
+
+def _encode_embedding(value: Any) -> Optional[str]:
+    # Packs here too: model_construct skips the validator, so the field may still hold floats
+    return base64.b64encode(_pack_embedding(value)).decode("ascii") if value is not None else None
 
 class ChatMessage(BaseModel):
     message: str
@@ -14,7 +35,19 @@ class ChatResponse(BaseModel):
     timestamp: datetime
     message_type: str = "ai_response"
     confidence: Optional[float] = None  # BERT confidence score
-    embeddings: Optional[List[float]] = None  # BERT embeddings
+    embeddings: Optional[bytes] = None  # BERT embeddings, little-endian float16
+
+    @field_validator("embeddings", mode="before")
+    @classmethod
+    def _pack_embeddings(cls, value: Any) -> Any:
+        return _pack_embedding(value)
+
+    @field_serializer("embeddings")
+    def _serialize_embeddings(self, value: Optional[bytes]) -> Optional[str]:
+        return _encode_embedding(value)
+
+    # Immutable once built; trusted internal results can skip validation with model_construct
+    model_config = ConfigDict(frozen=True, extra='ignore')
 
 class ChatSession(BaseModel):
     session_id: str
@@ -22,7 +55,15 @@ class ChatSession(BaseModel):
     messages: List[Dict[str, Any]]
     created_at: datetime
     updated_at: datetime
-    context_embeddings: Optional[List[List[float]]] = None  # Session context
+    context_embeddings: Optional[List[bytes]] = None  # Session context, little-endian float16
+
+    @field_validator("context_embeddings", mode="before")
+    @classmethod
+    def _pack_context_embeddings(cls, value: Any) -> Any:
+        return [_pack_embedding(item) for item in value] if isinstance(value, (list, tuple, np.ndarray)) else value
+
+    @field_serializer("context_embeddings")
+    def _serialize_context_embeddings(self, value: Optional[List[bytes]]) -> Optional[List[str]]:
+        return [_encode_embedding(item) for item in value] if value is not None else None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -19,5 +19,5 @@ class ProgressResponse(BaseModel):
     session_duration: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    # Progress records are never edited after they are read back
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
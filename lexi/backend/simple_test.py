@@ -2,6 +2,19 @@
 Simplified ML Model Accuracy Test for LexiLearn
 """
 
+# High risk answers for each question; each one selected earns a point
+RISK = {
+    "1": frozenset("cd"),
+    "2": frozenset("bc"),
+    "3": frozenset("cd"),
+    "4": frozenset("b"),
+    "5": frozenset("a"),
+    "6": frozenset("bc"),
+    "7": frozenset("c"),
+    "8": frozenset("cd"),
+}
+_NO_RISK = frozenset()
+
 def test_dyslexia_assessment():
     """Test dyslexia risk assessment accuracy"""
     def calculate_test_score(answers):
@@ -9,15 +22,7 @@ def test_dyslexia_assessment():
         risk_points = 0
         for q_id, answer in answers.items():
             selected = answer.get("selected")
-            # High risk answers get points
-            if (q_id == "1" and selected in ["c", "d"]) or \
-               (q_id == "2" and selected in ["b", "c"]) or \
-               (q_id == "3" and selected in ["c", "d"]) or \
-               (q_id == "4" and selected == "b") or \
-               (q_id == "5" and selected == "a") or \
-               (q_id == "6" and selected in ["b", "c"]) or \
-               (q_id == "7" and selected == "c") or \
-               (q_id == "8" and selected in ["c", "d"]):
+            if isinstance(selected, str) and selected in RISK.get(q_id, _NO_RISK):
                 risk_points += 1
         return (risk_points / 8) * 100
     
@@ -10,7 +10,7 @@ os.environ["DATABASE_TYPE"] = "sqlite"
 os.environ["DATABASE_URL"] = "sqlite:///test_lexi.db"
 
 from fastapi.testclient import TestClient
-from main import app
+from main import app, calculate_test_score
 
 client = TestClient(app)
 
@@ -208,6 +208,19 @@ class TestProgress:
         )
         assert response.status_code == 200
 
+class TestDyslexiaScore:
+    """Dyslexia test scoring"""
+
+    def test_non_string_answers_count_no_risk(self):
+        """Test that list or dict answers are scored as no risk instead of failing"""
+        score = calculate_test_score({
+            "1": {"selected": []},
+            "2": {"selected": {}},
+            "3": {"selected": "a"},
+            "4": {"selected": "b"}
+        })
+        assert score == 25.0
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -0,0 +1,116 @@
+"""
+Tests for handwriting image validation and batch recognition
+"""
+import asyncio
+import shutil
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+from ml_models import handwriting_recognition
+from ml_models.handwriting_recognition import HandwritingAnalyzer, TesseractOCRProcessor
+
+_WORDS = "the quick brown fox jumps over a lazy dog while my cat sleeps".split()
+_SCRIPT_FONT = cv2.FONT_HERSHEY_SCRIPT_SIMPLEX
+
+
+def _paper(width, height):
+    return np.full((height, width, 3), 245, np.uint8)
+
+
+def _text_page(width, height, lines, line_height):
+    """Dark script lines on white paper, as many of `lines` as fit"""
+    page = _paper(width, height)
+    scale = cv2.getFontScaleFromHeight(_SCRIPT_FONT, line_height, 3)
+    y = line_height * 2
+    for i in range(lines):
+        words = " ".join(_WORDS[(i * 3) % 7:(i * 3) % 7 + 6])
+        cv2.putText(page, words, (width // 20, y), _SCRIPT_FONT, scale, (20, 20, 50), 3, cv2.LINE_AA)
+        y += int(line_height * 2.2)
+        if y > height - line_height:
+            break
+    return page
+
+
+def _noise(width, height):
+    return np.random.default_rng(1).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def _busy_scene(width, height, shapes):
+    """Small shapes in random colors packed together, like a cluttered photo"""
+    rng = np.random.default_rng(5)
+    scene = np.full((height, width, 3), 128, np.uint8)
+    for _ in range(shapes):
+        color = tuple(int(v) for v in rng.integers(0, 256, 3))
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        size = int(rng.integers(2, 12))
+        if rng.integers(0, 2):
+            cv2.circle(scene, (x, y), size, color, -1)
+        else:
+            cv2.rectangle(scene, (x, y), (x + size, y + size), color, -1)
+    return scene
+
+
+def _use_ocr_executor() -> int:
+    """Run in a batch worker: the shared OCR thread pool must still pick up work there"""
+    return handwriting_recognition._OCR_EXECUTOR.submit(sum, [1, 2]).result(timeout=5)
+
+
+@pytest.fixture
+def page_images(tmp_path):
+    paths = []
+    for idx in range(2):
+        path = tmp_path / f"page_{idx}.png"
+        Image.fromarray(_text_page(1200, 900, 4 + idx, 60)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+class TestContentValidation:
+    """Content checks on a synthetic calibration set"""
+
+    @pytest.mark.parametrize("make_image, expected", [
+        (lambda: _paper(1200, 900), "uniform_color"),
+        (lambda: _text_page(1200, 900, 12, 60), "handwriting"),
+        (lambda: _text_page(2000, 1500, 8, 40), "no_content"),
+        (lambda: _noise(1000, 750), "complex_scene"),
+        (lambda: _busy_scene(1000, 750, 12000), "complex_scene"),
+    ], ids=["blank", "text", "sparse_text", "noise", "busy_scene"])
+    def test_detected_type(self, make_image, expected):
+        """Test that each kind of image gets its expected classification"""
+        result = TesseractOCRProcessor()._validate_image_content(Image.fromarray(make_image()))
+        assert result["detected_type"] == expected
+
+
+class TestBatchRecognition:
+    """Batch recognition in worker processes"""
+
+    @pytest.mark.skipif(shutil.which("tesseract") is None, reason="Tesseract is not installed")
+    def test_single_then_batch(self, page_images):
+        """Test a single-image recognition followed by a two-image batch"""
+        analyzer = HandwritingAnalyzer()
+
+        async def run():
+            single = await analyzer.recognize_handwriting(page_images[0])
+            batch = await asyncio.wait_for(analyzer.recognize_handwriting_batch(page_images), timeout=120)
+            return single, batch
+
+        single, batch = asyncio.run(run())
+        assert single["success"]
+        assert len(batch) == 2
+        assert batch[0]["recognized_text"] == single["recognized_text"]
+
+    def test_batch_worker_can_use_ocr_executor(self):
+        """Test that batch workers get working OCR threads after the parent used them"""
+        assert handwriting_recognition._OCR_EXECUTOR.submit(sum, [1, 1]).result(timeout=5) == 2
+        pool = handwriting_recognition._batch_pool(1)
+        assert pool.submit(_use_ocr_executor).result(timeout=120) == 3
+
+    def test_batches_share_worker_pool(self, page_images):
+        """Test that consecutive batches reuse one set of worker processes"""
+        analyzer = HandwritingAnalyzer()
+        first = asyncio.run(analyzer.recognize_handwriting_batch(page_images, max_workers=2))
+        pool = handwriting_recognition._BATCH_POOLS[2]
+        second = asyncio.run(analyzer.recognize_handwriting_batch(page_images, max_workers=2))
+        assert handwriting_recognition._BATCH_POOLS[2] is pool
+        assert len(first) == len(second) == 2
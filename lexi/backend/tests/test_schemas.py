@@ -0,0 +1,52 @@
+"""
+Tests for the chat schemas' packed float16 embeddings
+"""
+from datetime import datetime
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from schemas.chat import ChatResponse, ChatSession
+
+VECTOR = [0.5, -1.25, 3.0, 0.0]
+PACKED = np.asarray(VECTOR, dtype="<f2").tobytes()
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _response(**fields):
+    return ChatResponse(message="hi", timestamp=NOW, **fields)
+
+
+class TestEmbeddingPacking:
+    """Embeddings are stored as float16 bytes and travel as base64"""
+
+    @pytest.mark.parametrize("embeddings", [
+        VECTOR, tuple(VECTOR), np.asarray(VECTOR, dtype=np.float32), PACKED
+    ], ids=["list", "tuple", "ndarray", "bytes"])
+    def test_json_round_trip(self, embeddings):
+        """Test validate -> model_dump_json -> model_validate_json for each input form"""
+        response = _response(embeddings=embeddings)
+        assert response.embeddings == PACKED
+        restored = ChatResponse.model_validate_json(response.model_dump_json())
+        assert restored.embeddings == PACKED
+        assert np.frombuffer(restored.embeddings, dtype="<f2").tolist() == VECTOR
+
+    def test_model_construct_round_trip(self):
+        """Test that an unvalidated float list still serializes as packed float16"""
+        built = ChatResponse.model_construct(message="hi", timestamp=NOW, embeddings=VECTOR)
+        assert built.model_dump_json() == _response(embeddings=VECTOR).model_dump_json()
+        assert ChatResponse.model_validate_json(built.model_dump_json()).embeddings == PACKED
+
+    def test_session_context_round_trip(self):
+        """Test context embeddings given as a 2-D array, validated and constructed"""
+        rows = np.asarray([VECTOR, VECTOR[::-1]], dtype=np.float32)
+        fields = dict(session_id="s1", user_id=1, messages=[], created_at=NOW, updated_at=NOW)
+        session = ChatSession(context_embeddings=rows, **fields)
+        restored = ChatSession.model_validate_json(session.model_dump_json())
+        assert restored.context_embeddings == [PACKED, np.asarray(VECTOR[::-1], dtype="<f2").tobytes()]
+        built = ChatSession.model_construct(context_embeddings=rows, **fields)
+        assert built.model_dump_json() == session.model_dump_json()
+
+    def test_out_of_range_rejected(self):
+        """Test that values float16 cannot hold fail validation"""
+        with pytest.raises(ValidationError):
+            _response(embeddings=[1e6])
@@ -0,0 +1,89 @@
+"""
+Tests for read-aloud word comparison
+"""
+import asyncio
+import random
+import pytest
+from ml_models import speech_processing_alternative
+from ml_models.speech_processing_alternative import SpeechAnalyzer
+
+EXPECTED = "the cat sat on the mat"
+
+
+@pytest.fixture(params=["rapidfuzz", "fallback"])
+def analyzer(request, monkeypatch):
+    """SpeechAnalyzer aligning words with rapidfuzz, or with the Wagner-Fischer fallback"""
+    if request.param == "rapidfuzz":
+        pytest.importorskip("rapidfuzz")
+    else:
+        monkeypatch.setattr(speech_processing_alternative, "Levenshtein", None)
+    return SpeechAnalyzer()
+
+
+def _word_errors(analyzer, transcribed, expected):
+    result = asyncio.run(analyzer.analyze_speech_errors(transcribed, expected))
+    errors = [(e["type"], e["position"], e["said"], e["expected"]) for e in result["errors"]]
+    return result["accuracy"], errors
+
+
+class TestWordComparison:
+    """Accuracy (1 - word error rate) and the word errors behind it"""
+
+    def test_inserted_word(self, analyzer):
+        """Test that an extra word is one error, not a shift of every later word"""
+        accuracy, errors = _word_errors(analyzer, "the cat sat down on the mat", EXPECTED)
+        assert accuracy == 83.33
+        assert errors == [("extra_word", 3, "down", "")]
+
+    def test_deleted_word(self, analyzer):
+        """Test that a skipped word is reported as missing"""
+        accuracy, errors = _word_errors(analyzer, "the cat on the mat", EXPECTED)
+        assert accuracy == 83.33
+        assert errors == [("missing_word", 2, "", "sat")]
+
+    def test_substituted_word(self, analyzer):
+        """Test that a misread word is a pronunciation error"""
+        accuracy, errors = _word_errors(analyzer, "the bat sat on the mat", EXPECTED)
+        assert accuracy == 83.33
+        assert errors == [("pronunciation_error", 1, "bat", "cat")]
+
+    def test_empty_expected_text(self, analyzer):
+        """Test that expected text with no words scores 0 with no word errors"""
+        assert _word_errors(analyzer, "the cat sat", "   ") == (0.0, [])
+
+
+class TestLongPassages:
+    """Passages of 32+ words, where the fallback fills its table with NumPy rows"""
+
+    def test_long_passage_errors(self, analyzer):
+        """Test one skipped, one misread and one extra word in a 40-word passage"""
+        expected = [f"word{i}" for i in range(40)]
+        said = expected[:5] + expected[6:17] + ["wrong"] + expected[18:31] + ["extra"] + expected[31:]
+        accuracy, errors = _word_errors(analyzer, " ".join(said), " ".join(expected))
+        assert accuracy == 92.5
+        assert errors == [
+            ("missing_word", 5, "", "word5"),
+            ("pronunciation_error", 17, "wrong", "word17"),
+            ("extra_word", 31, "extra", ""),
+        ]
+
+    def test_vectorized_table_matches_scalar(self, monkeypatch):
+        """Test that NumPy rows, the scalar loop and rapidfuzz agree on random passages"""
+        pytest.importorskip("numpy")
+        rng = random.Random(7)
+        vocabulary = ["the", "a", "cat", "sat", "on", "mat", "dog", "ran"]
+        passages = [
+            ([rng.choice(vocabulary) for _ in range(rng.randint(32, 80))],
+             [rng.choice(vocabulary) for _ in range(rng.randint(32, 80))])
+            for _ in range(20)
+        ]
+        rapidfuzz_ops = None
+        if speech_processing_alternative.Levenshtein is not None:
+            rapidfuzz_ops = [speech_processing_alternative._word_editops(s, t) for s, t in passages]
+        monkeypatch.setattr(speech_processing_alternative, "Levenshtein", None)
+        vectorized = [speech_processing_alternative._word_editops(s, t) for s, t in passages]
+        monkeypatch.setattr(speech_processing_alternative, "_VECTORIZE_MIN_WORDS", 10 ** 6)
+        scalar = [speech_processing_alternative._word_editops(s, t) for s, t in passages]
+        assert vectorized == scalar
+        if rapidfuzz_ops is not None:
+            assert [len(ops) for ops in rapidfuzz_ops] == [len(ops) for ops in scalar]
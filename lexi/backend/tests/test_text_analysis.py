@@ -0,0 +1,51 @@
+"""
+Tests for text analysis and the shared correction tables
+"""
+import asyncio
+from ml_models import _corrections
+from ml_models.text_analysis import (
+    SimpleLocalAnalyzer, HuggingFaceAPIAnalyzer, OpenAIAPIAnalyzer, BERTTextAnalyzer
+)
+import ml_models.text_analysis as text_analysis
+
+class TestSharedCorrections:
+    """Every analyzer routes through the same correction objects"""
+
+    def test_analyzers_share_correction_table(self):
+        """Test that all analyzers use the shared spelling table"""
+        analyzers = [
+            SimpleLocalAnalyzer(),
+            HuggingFaceAPIAnalyzer().fallback_analyzer,
+            OpenAIAPIAnalyzer().fallback_analyzer,
+            BERTTextAnalyzer().fallback_analyzer
+        ]
+        for analyzer in analyzers:
+            assert analyzer.spelling_corrections is _corrections.CORRECTIONS
+            assert analyzer._word_checks is _corrections.WORD_CHECKS
+
+    def test_bert_fallback_uses_shared_pattern(self):
+        """Test the BERT grammar fallback with the shared pattern"""
+        assert text_analysis.CORRECTION_RE is _corrections.CORRECTION_RE
+        analyzer = BERTTextAnalyzer()
+        analyzer.grammar_checker = None
+        assert analyzer._correct_with_bert("Teh nite was seperate") == "the night was separate"
+
+    def test_simple_analysis_uses_shared_tables(self):
+        """Test spelling, reversal and phonetic detection"""
+        analysis = asyncio.run(SimpleLocalAnalyzer().analyze_text("teh boy wuz abd happy"))
+        types = [error["type"] for error in analysis["errors"]]
+        assert types == ["spelling", "spelling", "spelling", "letter_reversal", "phonetic_error"]
+        assert analysis["corrected_text"] == "the boy was and happy"
+
+class TestCorrectedText:
+    """corrected_text rewrites only the misspelt words"""
+
+    def test_correction_keeps_capital(self):
+        """Test that a capitalized misspelling gets a capitalized correction"""
+        analysis = asyncio.run(SimpleLocalAnalyzer().analyze_text("Teh was adn gril."))
+        assert analysis["corrected_text"] == "The was adn gril."
+
+    def test_correction_stays_inside_its_word(self):
+        """Test that a correction never rewrites part of another word"""
+        analysis = asyncio.run(SimpleLocalAnalyzer().analyze_text("dog og, (teh)"))
+        assert analysis["corrected_text"] == "dog dog, (the)"